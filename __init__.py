@@ -32,6 +32,8 @@ bl_info = {
 
 import os, sys, bpy, pathlib, re, ctypes, site, subprocess, platform
 import ensurepip
+import bisect, gc, importlib.metadata, importlib.util, json, queue, socket, threading, time, uuid
+from collections import OrderedDict
 from bpy.props import (
     EnumProperty,
     StringProperty,
@@ -41,54 +43,622 @@ from bpy.props import (
     PointerProperty
 )
 from bpy.types import Operator
+from bpy.app.handlers import persistent
 from bpy_extras.io_utils import ImportHelper
 from datetime import timedelta
+from . import whisper_worker
 os_platform = platform.system()  # 'Linux', 'Darwin', 'Java', 'Windows'
 
 def get_strip_by_name(name):
-    for strip in bpy.context.scene.sequence_editor.sequences[0:]:
-        if strip.name == name:
-            return strip
+    # sequences_all.get is a hashed lookup inside Blender. A Python-side cache of strips
+    # can't be trusted: strips aren't data-blocks, so a cached one may already be freed.
+    editor = bpy.context.scene.sequence_editor
+    if editor is None:
+        return None
+    return editor.sequences_all.get(name)
+
+
+syncing_text_strip_items = False # Silences the list's update callbacks while it is synced
+
+
+def sync_text_strip_items(scene):
+    """Brings scene.text_strip_items in line with the scene's text strips, sorted by start frame.
+
+    Only the changed items are removed, added, moved or rewritten, so an edit costs RNA
+    writes for what it changed instead of rebuilding the list. Returns True if anything changed.
+    """
+    global syncing_text_strip_items
+    editor = scene.sequence_editor
+    items = scene.text_strip_items
+    text_strips = [strip for strip in editor.sequences if strip.type == "TEXT"] if editor else []
+    text_strips.sort(key=lambda strip: strip.frame_start)
+    names = [strip.name for strip in text_strips]
+    order = [item.name for item in items]
+    if order == names and all(item.text == strip.text for item, strip in zip(items, text_strips)):
+        return False
+
+    index = scene.text_strip_items_index
+    selected_name = order[index] if 0 <= index < len(order) else None
+    syncing_text_strip_items = True
+    try:
+        wanted = set(names)
+        for i in reversed(range(len(order))):
+            if order[i] not in wanted:
+                items.remove(i)
+                del order[i]
+        present = set(order)
+        for strip in text_strips:
+            if strip.name not in present:
+                item = items.add()
+                item.name = strip.name
+                order.append(strip.name)
+        for target, name in enumerate(names):
+            if order[target] != name:
+                current = order.index(name, target)
+                items.move(current, target)
+                order.insert(target, order.pop(current))
+        for item, strip in zip(items, text_strips):
+            if item.text != strip.text:
+                item.text = strip.text
+        # Keep the list selection on the same subtitle
+        if selected_name in wanted:
+            index = names.index(selected_name)
+        if index != scene.text_strip_items_index:
+            scene.text_strip_items_index = min(index, len(names) - 1) if names else 0
+    finally:
+        syncing_text_strip_items = False
+    return True
+
+
+def get_auto_sync_list():
+    try:
+        return bpy.context.preferences.addons[__name__].preferences.auto_sync_list
+    except (KeyError, AttributeError):
+        return False
+
+
+auto_sync_key = None # (scene, strip count) the list was last auto-synced for
+auto_sync_scene_name = None
+
+
+def run_auto_sync():
+    """One-shot timer doing the sync outside the depsgraph handler, so its writes don't re-enter it."""
+    global auto_sync_key
+    scene = bpy.data.scenes.get(auto_sync_scene_name) if auto_sync_scene_name else None
+    if scene is not None and scene.sequence_editor is not None:
+        sync_text_strip_items(scene)
+        auto_sync_key = (scene.as_pointer(), len(scene.sequence_editor.sequences_all))
     return None
 
-FASTER_WHISPER_VERSION = "1.0.3" # Or latest known stable version
+
+@persistent
+def auto_sync_text_strip_items(scene, depsgraph):
+    """depsgraph_update_post handler syncing the subtitle list once strips were added or removed.
+
+    Only the strip count is compared here, so typing (which updates the scene on
+    every keystroke) costs nothing. Moved strips still need Refresh List.
+    """
+    global auto_sync_scene_name
+    editor = scene.sequence_editor
+    if editor is None or not get_auto_sync_list():
+        return
+    if (scene.as_pointer(), len(editor.sequences_all)) == auto_sync_key:
+        return
+    auto_sync_scene_name = scene.name
+    if not bpy.app.timers.is_registered(run_auto_sync):
+        bpy.app.timers.register(run_auto_sync, first_interval=0.0)
+
+
+@persistent
+def stop_jobs_on_load(filepath):
+    """load_pre handler: Blender drops the job timers when a file is loaded, so stop their jobs too.
+
+    Otherwise nothing would ever clear the job globals and the operators stay disabled.
+    """
+    global autotune_task, transcription_status_message
+    if transcription_job is not None:
+        cancel_transcription_job()
+        transcription_status_message = "Transcription cancelled because another file was loaded."
+        print(transcription_status_message)
+    if autotune_task is not None:
+        # Its results are dropped: the scene they would be applied to is gone
+        autotune_task.cancel_event.set()
+        autotune_task = None
+        transcription_status_message = "Auto-tune cancelled because another file was loaded."
+        print(transcription_status_message)
+
+
+APP_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, auto_sync_text_strip_items),
+    (bpy.app.handlers.load_pre, stop_jobs_on_load),
+)
+
+FASTER_WHISPER_VERSION = "1.1.1" # 1.1+ is needed for BatchedInferencePipeline
 REQUIRED_PACKAGE = f"faster-whisper=={FASTER_WHISPER_VERSION}"
-dependencies_checked = False
-dependencies_installed = False
-faster_whisper_module = None
-
-
-def find_first_empty_channel(start_frame, end_frame):
-    for ch in range(1, len(bpy.context.scene.sequence_editor.sequences_all) + 1):
-        for seq in bpy.context.scene.sequence_editor.sequences_all:
-            if (
-                seq.channel == ch
-                and seq.frame_final_start < end_frame
-                and seq.frame_final_end > start_frame
-            ):
+dependencies_checked = False # faster-whisper was imported successfully (this or an earlier session)
+dependencies_installed = False # faster-whisper is on the path; it may not be imported yet
+faster_whisper_module = None # Imported on first use, see get_faster_whisper()
+faster_whisper_stamp_path = None # Set in register()
+faster_whisper_version = None # Installed version, None if unknown or not installed
+
+# Loaded WhisperModel instances keyed by (model_size, device, compute_type, cpu_threads, num_workers).
+# Ordered from least to most recently used, so eviction pops from the front.
+whisper_model_cache = OrderedDict()
+model_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+model_cache_lock = threading.Lock()
+model_loads_in_flight = {} # key -> threading.Event set once that load finishes or fails, guarded by model_cache_lock
+
+# Approximate parameter counts (millions), matching the WhisperProperties.model_size items.
+MODEL_PARAMS_M = {
+    "tiny": 39,
+    "base": 74,
+    "small": 244,
+    "medium": 769,
+    "distil-small.en": 206,
+    "distil-medium.en": 668,
+    "distil-large-v2": 1364,
+    "large-v1": 1550,
+    "large-v2": 1550,
+    "large-v3": 1550,
+}
+COMPUTE_TYPE_BYTES = {"int8": 1, "int8_float16": 1, "float16": 2, "float32": 4}
+
+
+def estimate_model_memory_mb(model_size, compute_type, num_workers=1):
+    """Rough resident size of a loaded model in MB (weights plus runtime overhead).
+
+    Every extra model worker adds its own buffers and decoding state on top of the weights.
+    """
+    params_m = MODEL_PARAMS_M.get(model_size, 1550)
+    bytes_per_param = COMPUTE_TYPE_BYTES.get(compute_type, 4)
+    return int(params_m * bytes_per_param * (1.2 + 0.3 * (max(1, num_workers) - 1))) + 150
+
+
+def get_model_cache_budget_mb():
+    """Model cache RAM budget from the add-on preferences (MB)."""
+    try:
+        return bpy.context.preferences.addons[__name__].preferences.model_cache_budget
+    except (KeyError, AttributeError):
+        return 4096
+
+
+def model_cache_usage_mb():
+    with model_cache_lock:
+        keys = list(whisper_model_cache)
+    return sum(estimate_model_memory_mb(key[0], key[2], key[4]) for key in keys)
+
+
+def get_whisper_model(model_size, device, compute_type, cpu_threads=0, num_workers=1, budget_mb=None, model_store=None):
+    """Returns a cached WhisperModel, loading it (and evicting LRU models over budget) on a miss.
+
+    Safe to call from a worker thread as long as budget_mb and model_store are
+    passed in, since the preferences lookup touches bpy.context.
+    """
+    key = (model_size, device, compute_type, cpu_threads, num_workers)
+    while True:
+        with model_cache_lock:
+            model = whisper_model_cache.get(key)
+            if model is not None:
+                whisper_model_cache.move_to_end(key)
+                model_cache_stats["hits"] += 1
+                print(f"Model cache hit: {key}")
+                return model
+
+            loading = model_loads_in_flight.get(key)
+            if loading is None:
+                loading = model_loads_in_flight[key] = threading.Event()
+                model_cache_stats["misses"] += 1
+                print(f"Model cache miss: {key}")
+
+                # Make room before loading so two large models are never resident over budget.
+                # Models still loading on other threads count towards the budget too.
+                budget = get_model_cache_budget_mb() if budget_mb is None else budget_mb
+                usage = sum(estimate_model_memory_mb(k[0], k[2], k[4]) for k in whisper_model_cache)
+                usage += sum(estimate_model_memory_mb(k[0], k[2], k[4]) for k in model_loads_in_flight)
+                while whisper_model_cache and usage > budget:
+                    old_key, old_model = whisper_model_cache.popitem(last=False)
+                    del old_model
+                    usage -= estimate_model_memory_mb(old_key[0], old_key[2], old_key[4])
+                    model_cache_stats["evictions"] += 1
+                    print(f"Evicted model from cache: {old_key}")
                 break
-        else:
-            return ch
-    return 1
+        # Another thread is loading this model: wait for it and look again. If that load
+        # failed the entry is gone and this thread loads the model itself.
+        print(f"Waiting for model load: {key}")
+        loading.wait()
+    gc.collect()
 
+    # Loading happens outside the lock so the panel can keep drawing cache stats.
+    try:
+        model_path = whisper_worker.resolve_model(model_size, get_model_store() if model_store is None else model_store)
+        model = get_faster_whisper().WhisperModel(
+            model_path, device=device, compute_type=compute_type, cpu_threads=cpu_threads, num_workers=num_workers
+        )
+        with model_cache_lock:
+            whisper_model_cache[key] = model
+    finally:
+        with model_cache_lock:
+            del model_loads_in_flight[key]
+        loading.set()
+    return model
+
+
+def unload_whisper_models():
+    """Drops every cached model. Returns the number of models unloaded."""
+    global openai_whisper_model
+    with model_cache_lock:
+        count = len(whisper_model_cache)
+        whisper_model_cache.clear()
+    if openai_whisper_model is not None:
+        openai_whisper_model = None
+        count += 1
+    gc.collect()
+    return count
+
+
+# (model name, model) of the openai-whisper model TEXT_OT_transcribe used last, kept warm between runs
+openai_whisper_model = None
+
+
+def get_openai_whisper_model(name):
+    global openai_whisper_model
+    if openai_whisper_model is None or openai_whisper_model[0] != name:
+        import whisper
+        openai_whisper_model = None # Free the old one before loading the next
+        gc.collect()
+        print(f"Loading openai-whisper model: {name}")
+        openai_whisper_model = (name, whisper.load_model(name))
+    return openai_whisper_model[1]
 
-def update_text(self, context):
-    for strip in bpy.context.scene.sequence_editor.sequences:
-        if strip.type == "TEXT" and strip.name == self.name:
-            # Update the text of the text strip
-            strip.text = self.text
-
-            get_strip = get_strip_by_name(self.name)
-            if get_strip:
-                # Deselect all strips.
-                for seq in context.scene.sequence_editor.sequences_all:
-                    seq.select = False
-                bpy.context.scene.sequence_editor.active_strip = strip
-                get_strip.select = True
 
-                # Set the current frame to the start frame of the active strip
-                bpy.context.scene.frame_set(int(strip.frame_start))
-            break
+def get_addon_cache_dir(name):
+    """Directory for the add-on's on-disk caches, created on demand."""
+    return bpy.utils.user_resource('DATAFILES', path=os.path.join("subtitle_editor", name), create=True)
+
+
+def get_result_cache_dir(props):
+    """Result cache directory if the scene has the transcription cache enabled, else None."""
+    return get_addon_cache_dir("transcriptions") if props.use_result_cache else None
+
+
+def get_checkpoint_dir(props):
+    """Fallback checkpoint directory if resumable transcription is enabled, else None."""
+    return get_addon_cache_dir("checkpoints") if props.use_checkpoints else None
+
+
+def get_model_store():
+    """(local model directory, offline) from the preferences, for whisper_worker.resolve_model."""
+    try:
+        prefs = bpy.context.preferences.addons[__name__].preferences
+        model_dir, offline = bpy.path.abspath(prefs.model_dir), prefs.offline_mode
+    except (KeyError, AttributeError):
+        model_dir, offline = "", False
+    return (model_dir or get_addon_cache_dir("models"), offline)
+
+
+def get_decode_cache():
+    """(directory, max_bytes) for the decoded-audio cache, or None when disabled in the preferences."""
+    try:
+        size_mb = bpy.context.preferences.addons[__name__].preferences.decode_cache_size
+    except (KeyError, AttributeError):
+        size_mb = 2048
+    if size_mb <= 0:
+        return None
+    return (get_addon_cache_dir("decoded_audio"), size_mb * 1024 * 1024)
+
+
+# --- Benchmark History ---
+
+# {"runs": [...], "best": {model_size: {device: run}}}, loaded on first use
+benchmark_history = None
+BENCHMARK_HISTORY_LIMIT = 200
+
+
+def get_benchmark_history():
+    global benchmark_history
+    if benchmark_history is None:
+        path = os.path.join(get_addon_cache_dir("benchmarks"), "history.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                benchmark_history = json.load(f)
+        except (OSError, ValueError):
+            benchmark_history = {"runs": [], "best": {}}
+    return benchmark_history
+
+
+def save_benchmark_history():
+    path = os.path.join(get_addon_cache_dir("benchmarks"), "history.json")
+    history = get_benchmark_history()
+    history["runs"] = history["runs"][-BENCHMARK_HISTORY_LIMIT:]
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def get_tuned_settings(model_size, device):
+    """The fastest benchmarked run for this model size and device, or None."""
+    return get_benchmark_history()["best"].get(model_size, {}).get(device)
+
+
+# --- Pre-flight Estimate ---
+
+# Real-time factor of int8 on CPU per million parameters when nothing has been benchmarked yet
+DEFAULT_RTF_PER_M_PARAMS = 0.0006
+COMPUTE_TYPE_SPEED = {"int8": 1.0, "int8_float16": 1.0, "float16": 1.5, "float32": 2.0}
+
+
+def get_available_memory_mb():
+    """Physical memory available to new allocations in MB, or None where it can't be read."""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/meminfo", "r") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) // 1024
+        except (OSError, ValueError, IndexError):
+            return None
+    elif os_platform == "Windows":
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys // (1024 * 1024)
+        return None
+    try:
+        import psutil
+        return psutil.virtual_memory().available // (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def estimate_rtf(model_size, device, compute_type, cpu_threads):
+    """(real-time factor, where it came from) for a configuration, preferring local benchmark runs."""
+    runs = [run for run in get_benchmark_history()["runs"] if run["device"] == device]
+    same = [run for run in runs if run["model_size"] == model_size and run["compute_type"] == compute_type]
+    exact = [run for run in same if run["cpu_threads"] == cpu_threads]
+    if exact:
+        return exact[-1]["rtf"], "benchmark"
+    if same:
+        return min(run["rtf"] for run in same), "benchmark, other threads"
+    # Scale the fastest run on this device by model size and precision
+    params = MODEL_PARAMS_M.get(model_size, 1550)
+    speed = COMPUTE_TYPE_SPEED.get(compute_type, 2.0)
+    scaled = [
+        run["rtf"] * (params / MODEL_PARAMS_M.get(run["model_size"], 1550)) * (speed / COMPUTE_TYPE_SPEED.get(run["compute_type"], 2.0))
+        for run in runs
+    ]
+    if scaled:
+        return min(scaled), "scaled from benchmarks"
+    rtf = params * DEFAULT_RTF_PER_M_PARAMS * speed
+    if device == 'cuda':
+        rtf *= 0.1
+    return rtf, "rough guess, run Auto-tune"
+
+
+def estimate_transcription(props, duration, processes=1):
+    """Pre-flight estimate for transcribing `duration` seconds of audio with the scene's settings.
+
+    Returns a dict with seconds, rtf, rtf_source, memory_mb (RAM needed) and
+    available_mb (None when unknown). Models that are already loaded, in Blender
+    or in the shared worker server, need no extra memory.
+    """
+    model_size, device, compute_type, cpu_threads, num_workers = get_model_args(props)
+    rtf, source = estimate_rtf(model_size, device, compute_type, cpu_threads)
+    if props.use_adaptive_beam and props.beam_size > 1:
+        rtf *= 0.5
+    if props.transcription_mode == 'BATCHED':
+        rtf *= 0.4
+
+    tuned = [
+        run for run in get_benchmark_history()["runs"]
+        if (run["model_size"], run["device"], run["compute_type"]) == (model_size, device, compute_type)
+    ]
+    if tuned:
+        model_mb = max(run["peak_mb"] for run in tuned)
+    else:
+        model_mb = estimate_model_memory_mb(model_size, compute_type, num_workers)
+    detector_mb = 0
+    if props.language == "auto" and props.language_model != 'NONE' and not model_size.endswith(".en"):
+        detector_mb = estimate_model_memory_mb(props.language_model, "int8")
+    if device == 'cuda':
+        model_mb = 300 # Weights live in VRAM, which isn't checked here
+        detector_mb = min(detector_mb, 100)
+    server = get_worker_server_settings()
+    if server:
+        state = whisper_worker.read_server_state(server[0]) or {}
+        loaded = [config[:3] for config in state.get("models", [])]
+        if [model_size, device, compute_type] in loaded:
+            model_mb = 0 # One warm model in the server serves every connection
+        if [props.language_model, device, "int8"] in loaded:
+            detector_mb = 0
+    elif processes == 1:
+        with model_cache_lock:
+            cached = {key[:3] for key in whisper_model_cache}
+        if (model_size, device, compute_type) in cached:
+            model_mb = 0 # Already loaded in Blender
+        if (props.language_model, device, "int8") in cached:
+            detector_mb = 0
+    audio_mb = duration * whisper_worker.SAMPLE_RATE * 4 / (1024 * 1024)
+    return dict(
+        seconds=duration * rtf / max(1, processes),
+        rtf=rtf,
+        rtf_source=source,
+        memory_mb=int((model_mb + detector_mb) * processes + audio_mb),
+        available_mb=get_available_memory_mb(),
+    )
+
+
+# (key, time, estimate) of the last estimate drawn in the Whisper panel
+panel_estimate = (None, 0.0, None)
+PANEL_ESTIMATE_SECONDS = 5.0 # Free memory is re-read at most this often while nothing else changes
+
+
+def get_panel_estimate(props, strips, fps, processes):
+    """estimate_transcription for the panel, cached per selection and settings across redraws."""
+    global panel_estimate
+    key = (
+        tuple((strip.name, strip.frame_final_duration) for strip in strips), fps, processes,
+        get_model_args(props), props.use_adaptive_beam, props.beam_size, props.transcription_mode,
+        props.language, props.language_model,
+    )
+    cached_key, cached_time, estimate = panel_estimate
+    now = time.monotonic()
+    if key != cached_key or now - cached_time > PANEL_ESTIMATE_SECONDS:
+        estimate = estimate_transcription(props, sum(strip.frame_final_duration for strip in strips) / fps, processes)
+        panel_estimate = (key, now, estimate)
+    return estimate
+
+
+def format_duration(seconds):
+    if seconds < 90:
+        return f"{seconds:.0f} s"
+    if seconds < 5400:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def cached_result_exists(props, audio_filepath, clip, transcribe_kwargs):
+    """True if the result cache already holds this transcription, which then needs no model."""
+    cache_dir = get_result_cache_dir(props)
+    if not cache_dir:
+        return False
+    try:
+        key = whisper_worker.result_cache_key(audio_filepath, clip, [props.model_size, props.compute_type], transcribe_kwargs)
+    except OSError:
+        return False
+    return os.path.exists(os.path.join(cache_dir, key + ".jsonl"))
+
+
+def preflight_check(operator, props, items, transcribe_kwargs, processes=1):
+    """Reports and returns False if the job would need more RAM than is available.
+
+    items are (audio file, clip, duration in seconds); the ones already in the
+    result cache are left out of the estimate.
+    """
+    duration = sum(
+        item_duration for audio_filepath, clip, item_duration in items
+        if not cached_result_exists(props, audio_filepath, clip, transcribe_kwargs)
+    )
+    if duration == 0:
+        print("Pre-flight: every file is in the result cache.")
+        return True
+    estimate = estimate_transcription(props, duration, processes)
+    print(f"Pre-flight estimate: {format_duration(estimate['seconds'])} (RTF {estimate['rtf']:.2f}, {estimate['rtf_source']}), "
+          f"~{estimate['memory_mb']} MB of {estimate['available_mb']} MB available")
+    if estimate["available_mb"] is not None and estimate["memory_mb"] > estimate["available_mb"]:
+        operator.report(
+            {'ERROR'},
+            f"Needs ~{estimate['memory_mb']} MB RAM but only {estimate['available_mb']} MB are free. "
+            f"Use a smaller model, int8, or fewer workers.",
+        )
+        return False
+    return True
+
+
+MAX_CHANNELS = 128 # The sequencer has no channels above this
+
+
+class ChannelIndex:
+    """Occupied frame ranges per channel, so free channels are found without rescanning every strip.
+
+    Build it once per operation and add() each strip created afterwards. Every channel keeps
+    its range starts sorted, with the running maximum of the range ends alongside, so
+    "is [start, end) free on this channel" is a single bisect even when ranges overlap
+    (strips inside metas share channel numbers with the top level).
+    """
+
+    def __init__(self, sequences=()):
+        self.channels = {} # channel -> (sorted starts, running max of ends)
+        ranges = {}
+        for seq in sequences:
+            ranges.setdefault(seq.channel, []).append((seq.frame_final_start, seq.frame_final_end))
+        for channel, spans in ranges.items():
+            spans.sort()
+            starts = []
+            max_ends = []
+            for start, end in spans:
+                starts.append(start)
+                max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+            self.channels[channel] = (starts, max_ends)
+
+    def add(self, channel, start_frame, end_frame):
+        starts, max_ends = self.channels.setdefault(channel, ([], []))
+        i = bisect.bisect_right(starts, start_frame)
+        starts.insert(i, start_frame)
+        max_ends.insert(i, max(end_frame, max_ends[i - 1]) if i else end_frame)
+        for j in range(i + 1, len(max_ends)):
+            if max_ends[j] >= max_ends[i]:
+                break
+            max_ends[j] = max_ends[i]
+
+    def add_strip(self, strip):
+        # Use the strip's own placement: Blender moves new strips up when the channel is taken
+        self.add(strip.channel, strip.frame_final_start, strip.frame_final_end)
+
+    def is_free(self, channel, start_frame, end_frame):
+        if channel not in self.channels:
+            return True
+        starts, max_ends = self.channels[channel]
+        i = bisect.bisect_left(starts, end_frame) # Ranges before i start before end_frame
+        return i == 0 or max_ends[i - 1] <= start_frame
+
+    def first_free(self, start_frame, end_frame, min_channel=1):
+        """Lowest channel >= min_channel with nothing in [start_frame, end_frame).
+
+        Falls back to min_channel when every channel up to MAX_CHANNELS is taken.
+        """
+        for channel in range(min_channel, MAX_CHANNELS + 1):
+            if self.is_free(channel, start_frame, end_frame):
+                return channel
+        return min_channel
+
+    def top_channel(self):
+        return max(self.channels, default=0)
+
+
+focused_text_item = None # Name of the list item whose strip update_text last selected
+
+
+def select_text_strip(context, strip):
+    """Makes strip the only selected and the active strip, and jumps to its start."""
+    # Deselect all strips. Reading select is cheaper than writing it, so skip unselected ones
+    for seq in context.scene.sequence_editor.sequences_all:
+        if seq.select and seq != strip:
+            seq.select = False
+    context.scene.sequence_editor.active_strip = strip
+    strip.select = True
+
+    # Set the current frame to the start frame of the active strip
+    context.scene.frame_set(int(strip.frame_start))
+
+
+def update_text(self, context):
+    # Runs on every keystroke (TEXTEDIT_UPDATE): while the same item is edited only the
+    # strip text is written, selecting and frame_set wait until another item gets focus.
+    global focused_text_item
+    if syncing_text_strip_items:
+        return
+    strip = get_strip_by_name(self.name)
+    if not strip or strip.type != "TEXT":
+        return
+    if strip.text != self.text:
+        strip.text = self.text
+    if focused_text_item != self.name:
+        focused_text_item = self.name
+        select_text_strip(context, strip)
 
 
 def show_system_console(show):
@@ -133,6 +703,59 @@ def get_selected_strip(context):
             return strip
     return None
 
+
+def get_selected_sound_strips(context):
+    """Gets all selected, unmuted audio strips that have a sound file."""
+    return [
+        strip for strip in context.selected_sequences
+        if strip.type == 'SOUND' and not strip.mute and strip.sound and strip.sound.filepath
+    ]
+
+
+def get_strip_audio_window(strip, fps):
+    """Returns (clip, offset_frame) for the part of its source a sound strip actually plays.
+
+    clip is the (start, end) window in source seconds, or None when the strip is
+    untrimmed; offset_frame is the scene frame that time 0 of the transcribed
+    audio lands on.
+    """
+    if strip.frame_offset_start <= 0 and strip.frame_offset_end <= 0:
+        return None, strip.frame_start
+    start = strip.frame_offset_start / fps
+    return (start, start + strip.frame_final_duration / fps), strip.frame_final_start
+
+
+ALLOWED_AUDIO_EXTENSIONS = {'.wav', '.mp3', '.ogg', '.flac', '.m4a', '.aac', '.wma', '.opus'} # Add more if needed
+
+
+def resolve_strip_audio(strip):
+    """Returns (absolute audio filepath, None) for a sound strip, or (None, error message)."""
+    try:
+        if not strip.sound or not strip.sound.filepath:
+             return None, f"Audio strip '{strip.name}' missing sound data or filepath."
+
+        audio_filepath = bpy.path.abspath(strip.sound.filepath) # Get path once
+
+        if not os.path.exists(audio_filepath): # Check existence once
+            return None, f"Audio file not found: {audio_filepath}"
+    except Exception as e:
+         import traceback
+         traceback.print_exc()
+         return None, f"Error accessing audio filepath for '{strip.name}': {e}"
+
+    _ , file_extension = os.path.splitext(audio_filepath)
+    if file_extension.lower() not in ALLOWED_AUDIO_EXTENSIONS:
+         # Specifically check for .blend
+         if file_extension.lower() == '.blend':
+              return None, (f"The source path for the audio strip points to a '.blend' file ({os.path.basename(audio_filepath)}), "
+                            f"not an audio file. Please correct the strip's 'File Path' in Blender's properties panel "
+                            f"or unpack the audio if it was packed.")
+         return None, (f"The source file ('{os.path.basename(audio_filepath)}') does not appear to be a supported audio format. "
+                       f"Supported types include: {', '.join(ALLOWED_AUDIO_EXTENSIONS)}. "
+                       f"Please check the strip's 'File Path' in Blender.")
+    return audio_filepath, None
+
+
 def ensure_user_site_packages(user_site_packages_path):
     """
     Ensures the user site-packages directory exists and attempts to make it writable.
@@ -162,19 +785,87 @@ def ensure_user_site_packages(user_site_packages_path):
     return True
 
 
+def faster_whisper_install_stamp(origin):
+    """Identifies an install of faster-whisper; reinstalling or upgrading it changes the stamp."""
+    try:
+        mtime = os.path.getmtime(os.path.dirname(origin))
+    except OSError:
+        mtime = 0
+    return {"origin": origin, "mtime": mtime}
+
+
+def parse_version(text):
+    """(1, 1, 1) from '1.1.1' or '1.1.1.post1', good enough to compare release numbers."""
+    return tuple(int(part) for part in re.findall(r"\d+", text)[:3])
+
+
+def faster_whisper_outdated():
+    """True if the installed faster-whisper is older than the pinned FASTER_WHISPER_VERSION."""
+    return faster_whisper_version is not None and parse_version(faster_whisper_version) < parse_version(FASTER_WHISPER_VERSION)
+
+
+def find_faster_whisper():
+    """Cheap startup check for faster-whisper that doesn't import it (or ctranslate2, av, ...).
+
+    Sets dependencies_installed from importlib's finder, and dependencies_checked
+    when this exact install was imported fine in an earlier session.
+    """
+    global dependencies_checked, dependencies_installed, faster_whisper_version
+    try:
+        spec = importlib.util.find_spec("faster_whisper")
+    except (ImportError, ValueError):
+        spec = None
+    dependencies_installed = spec is not None and spec.origin is not None
+    dependencies_checked = False
+    faster_whisper_version = None
+    if dependencies_installed:
+        # Package metadata only, still no import
+        try:
+            faster_whisper_version = importlib.metadata.version("faster-whisper")
+        except importlib.metadata.PackageNotFoundError:
+            pass
+        if faster_whisper_outdated():
+            print(f"faster-whisper {faster_whisper_version} is older than {FASTER_WHISPER_VERSION}. Run 'Install/Verify Dependencies' to upgrade.")
+            dependencies_installed = False
+            return False
+    if dependencies_installed and faster_whisper_stamp_path:
+        try:
+            with open(faster_whisper_stamp_path, "r", encoding="utf-8") as f:
+                dependencies_checked = json.load(f) == faster_whisper_install_stamp(spec.origin)
+        except (OSError, ValueError):
+            pass
+    return dependencies_installed
+
+
 def check_faster_whisper():
     """Checks if faster-whisper is installed and importable."""
-    global dependencies_installed, faster_whisper_module
+    global dependencies_checked, dependencies_installed, faster_whisper_module, faster_whisper_version
     if dependencies_installed and faster_whisper_module:
         return True
     try:
+        started = time.perf_counter()
         # Try importing the core component
         from faster_whisper import WhisperModel
         # Store the module for later use if needed (optional)
         import faster_whisper
+        faster_whisper_version = getattr(faster_whisper, "__version__", None)
+        if faster_whisper_outdated():
+            # Imports, but lacks BatchedInferencePipeline and detect_language
+            print(f"faster-whisper {faster_whisper_version} is older than {FASTER_WHISPER_VERSION}. Run 'Install/Verify Dependencies' to upgrade.")
+            dependencies_installed = False
+            faster_whisper_module = None
+            return False
         faster_whisper_module = faster_whisper
         dependencies_installed = True
-        print("faster-whisper found and imported successfully.")
+        dependencies_checked = True
+        print(f"faster-whisper found and imported successfully ({(time.perf_counter() - started) * 1000:.0f} ms).")
+        if faster_whisper_stamp_path:
+            # Lets the next session trust this install without importing it at startup
+            try:
+                with open(faster_whisper_stamp_path, "w", encoding="utf-8") as f:
+                    json.dump(faster_whisper_install_stamp(faster_whisper.__file__), f)
+            except OSError as e:
+                print(f"Could not write faster-whisper install stamp: {e}")
         return True
     except ImportError:
         dependencies_installed = False
@@ -188,6 +879,14 @@ def check_faster_whisper():
         print(f"An unexpected error occurred during faster-whisper import check: {e}")
         return False
 
+
+def get_faster_whisper():
+    """The faster_whisper module, imported on first use. None if it can't be imported."""
+    if faster_whisper_module is None:
+        check_faster_whisper()
+    return faster_whisper_module
+
+
 def install_dependencies(blender_python_exe):
     """Attempts to install faster-whisper using pip. Returns (bool success, str message)."""
     global dependencies_installed
@@ -241,6 +940,10 @@ def install_dependencies(blender_python_exe):
         print(process.stderr) # Print stderr even on success, might contain warnings
         print("------------------")
 
+        if faster_whisper_outdated() and "faster_whisper" in sys.modules:
+            # The old version stays imported until Blender restarts
+            return True, f"{REQUIRED_PACKAGE} installed. Restart Blender to use it."
+
         # Verify installation by trying to import again
         if check_faster_whisper():
             dependencies_installed = True
@@ -285,6 +988,629 @@ def install_dependencies(blender_python_exe):
     
 
 
+def segment_to_frames(start_time, end_time, fps, offset_frame):
+    """Converts segment times (seconds) to a (start, end) frame pair of at least one frame."""
+    start_frame = int(round(start_time * fps + offset_frame))
+    end_frame = int(round(end_time * fps + offset_frame))
+    # Ensure minimum duration of 1 frame
+    if end_frame <= start_frame:
+        end_frame = start_frame + 1
+    return start_frame, end_frame
+
+
+def add_subtitle_strip(scene, text, start_frame, end_frame, channel, font_size, text_align_y, wrap_width):
+    """Creates a styled subtitle text strip. Returns the strip, or None if creation failed."""
+    text_strip = scene.sequence_editor.sequences.new_effect(
+        name=f"Sub_{start_frame}",
+        type='TEXT',
+        channel=channel,
+        frame_start=start_frame,
+        frame_end=end_frame
+    )
+    if not text_strip:
+        return None
+
+    # Set text content
+    text_strip.text = text
+
+    # Set appearance properties
+    text_strip.font_size = font_size
+    text_strip.anchor_y = text_align_y
+    text_strip.anchor_x = 'CENTER'
+
+    # Adjust vertical position slightly
+    if text_align_y == 'BOTTOM':
+        text_strip.location[1] = 0.05
+    elif text_align_y == 'TOP':
+        text_strip.location[1] = 1.0 - 0.05 - (text_strip.font_size / scene.render.resolution_y)
+    else: # CENTER
+         text_strip.location[1] = 0.5
+
+    # Set wrapping
+    if wrap_width > 0:
+        text_strip.wrap_width = wrap_width
+    else:
+        text_strip.wrap_width = 0
+
+    # Set other useful defaults
+    text_strip.use_shadow = True
+    text_strip.shadow_color = (0, 0, 0, 1)
+    return text_strip
+
+
+def transcription_error_message(e):
+    """Maps a transcription exception to a user-facing hint."""
+    # Try to provide a more specific common error message
+    if "ffmpeg" in str(e).lower():
+         return "Transcription failed. Ensure FFmpeg is installed and in system PATH. Check Console."
+    elif "cuda" in str(e).lower() or "nvtx" in str(e).lower() or "cublas" in str(e).lower():
+         return "CUDA error. Ensure GPU drivers & CUDA Toolkit are installed correctly. Try CPU device. Check Console."
+    elif "memory" in str(e).lower():
+         return "Out of memory error. Try a smaller model, 'int8' compute type, or increase system RAM/VRAM. Check Console."
+    return "Transcription failed. Check Blender System Console for details."
+
+
+def get_word_timings_path(transcript_id):
+    return os.path.join(get_addon_cache_dir("word_timings"), transcript_id + ".bin")
+
+
+def tag_transcript_strip(strip, transcript_id, offset_frame):
+    """Links a subtitle strip to the word timings it was made from, so it can be re-split later."""
+    strip["whisper_transcript"] = transcript_id
+    strip["whisper_offset"] = float(offset_frame)
+
+
+def tag_sequencer_redraw():
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'SEQUENCE_EDITOR':
+                area.tag_redraw()
+
+
+# --- Background Transcription ---
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "whisper_worker.py")
+
+# The single running TranscriptionJob, or None. Only touched from the main thread.
+transcription_job = None
+# Outcome of the last background job, shown in the Whisper panel.
+transcription_status_message = ""
+
+
+class TranscriptionJob:
+    """A queue of audio files transcribed in the background and turned into text strips.
+
+    Each item is (audio_filepath, clip, [offset_frame, ...]): the file (or only the
+    clip=(start, end) seconds window of it) is transcribed once and its segments are
+    placed relative to every offset frame, one per strip that plays that window. Worker threads and
+    processes only write to `queue` and read `cancel_event`; everything that touches
+    bpy happens in drain_transcription_job on the main thread.
+    """
+
+    def __init__(self, scene_name, items, task, fps, output_channel, style, cache_dir=None, decode_cache=None, checkpoint_dir=None, split_chunks=False, model_store=None, language_detection=None):
+        self.scene_name = scene_name
+        self.language_detection = language_detection # {"model", "cache_dir"} for whisper_worker.transcribe, or None
+        self.languages = {} # item index -> language detected up front for split files
+        self.model_store = model_store # (local model directory, offline) from get_model_store()
+        self.checkpoint_dir = checkpoint_dir # Enables resumable checkpoints, used when the audio folder is read-only
+        self.split_chunks = split_chunks # Split items at VAD silences before fanning out
+        self.cache_dir = cache_dir # Result cache directory, None to always transcribe
+        self.decode_cache = decode_cache # (directory, max_bytes) of decoded audio, or None
+        self.items = items
+        self.task = task
+        self.fps = fps
+        self.output_channel = output_channel
+        self.style = style
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = None
+        self.durations = [0.0] * len(items)
+        self.file_progress = [0.0] * len(items)
+        self.files_done = 0
+        self.failed = []
+        self.num_segments = 0
+        self.created = 0
+        self.word_timings = {} # item index -> whisper_worker.WordTimings
+        self.transcript_ids = {} # item index -> id the strips are tagged with
+        self.status = "Loading model..."
+
+    @property
+    def progress(self):
+        return sum(self.file_progress) / max(1, len(self.items))
+
+
+def run_transcription_thread(job, model_args, budget_mb, transcribe_kwargs):
+    """Worker thread body: transcribes every item with one cached model, streaming segments into job.queue."""
+    model_size, _device, compute_type, _cpu_threads, _num_workers = model_args
+
+    def get_model(detector_size=None):
+        # Only loaded once a file misses the result cache
+        args = model_args if detector_size is None else whisper_worker.detector_config(model_args, detector_size)
+        try:
+            return get_whisper_model(*args, budget_mb=budget_mb, model_store=job.model_store)
+        except Exception as e:
+            raise whisper_worker.ModelLoadError(str(e)) from e
+
+    for index, (audio_filepath, clip, _offset_frames) in enumerate(job.items):
+        if job.cancel_event.is_set():
+            job.queue.put(("cancelled", None, None))
+            return
+        try:
+            segments, info = whisper_worker.transcribe(
+                get_model, audio_filepath, clip, [model_size, compute_type], transcribe_kwargs,
+                job.cache_dir, job.decode_cache, job.checkpoint_dir, job.language_detection,
+            )
+            job.queue.put(("info", index, (info.language, info.language_probability, info.duration)))
+            for segment in segments:
+                if job.cancel_event.is_set():
+                    # Closing the generator stops decoding of the remaining audio.
+                    segments.close()
+                    job.queue.put(("cancelled", None, None))
+                    return
+                job.queue.put(("segment", index, (segment.start, segment.end, segment.text.strip(), whisper_worker.segment_words(segment))))
+            job.queue.put(("file_done", index, None))
+        except whisper_worker.ModelLoadError as e:
+            job.queue.put(("error", None, e))
+            return
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            job.queue.put(("error", index, e))
+    job.queue.put(("done", None, None))
+
+
+def pump_worker_process(job, proc, pending):
+    """Feeds one whisper_worker.py process from `pending` and relays its messages into job.queue."""
+    in_flight = None
+
+    def send_next():
+        nonlocal in_flight
+        try:
+            in_flight = pending.get_nowait()
+        except queue.Empty:
+            in_flight = None
+            proc.stdin.close() # EOF tells the worker to exit
+            return
+        audio_filepath, clip, _offset_frames = job.items[in_flight]
+        message = {"id": in_flight, "audio": audio_filepath, "clip": clip, "language": job.languages.get(in_flight)}
+        proc.stdin.write(json.dumps(message) + "\n")
+        proc.stdin.flush()
+
+    try:
+        for line in proc.stdout:
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "ready":
+                send_next()
+            elif kind == "info":
+                job.queue.put(("info", message["id"], (message["language"], message["probability"], message["duration"])))
+            elif kind == "segment":
+                job.queue.put(("segment", message["id"], (message["start"], message["end"], message["text"], message.get("words"))))
+            elif kind == "file_done":
+                job.queue.put(("file_done", message["id"], None))
+                send_next()
+            elif kind == "error":
+                job.queue.put(("error", message["id"], RuntimeError(message["message"])))
+                send_next()
+            elif kind == "fatal":
+                # The model could not be loaded; hand the file back for another worker
+                print(f"Whisper worker process could not load the model: {message['message']}")
+                if in_flight is not None:
+                    pending.put(in_flight)
+                    in_flight = None
+                break
+    except (OSError, ValueError) as e:
+        # Broken pipe or truncated output after the process was killed
+        if not job.cancel_event.is_set():
+            print(f"Lost connection to Whisper worker process: {e}")
+    proc.wait()
+    if in_flight is not None and not job.cancel_event.is_set():
+        job.queue.put(("error", in_flight, RuntimeError(f"Worker stopped before finishing this file (exit code {proc.returncode}).")))
+
+
+def split_job_items(job, num_workers):
+    """Replaces each job item by windows cut at VAD silences, so one long file keeps every worker busy."""
+    job.status = "Splitting audio at silences..."
+    planned = []
+    languages = {}
+    for index, (audio_filepath, clip, offset_frames) in enumerate(job.items):
+        # Every part keeps the language detected over the item's whole clip
+        language = job.languages.get(index)
+        try:
+            windows = whisper_worker.plan_speech_chunks(
+                audio_filepath, clip, job.decode_cache, num_chunks=2 * num_workers
+            )
+        except Exception as e:
+            print(f"Could not split '{audio_filepath}' at silences, transcribing it in one piece: {e}")
+            if language:
+                languages[len(planned)] = language
+            planned.append((audio_filepath, clip, offset_frames))
+            continue
+        base = clip[0] if clip else 0.0
+        for window in windows:
+            if language:
+                languages[len(planned)] = language
+            # Shift the offsets so chunk-relative timestamps land at their global position
+            shift = (window[0] - base) * job.fps
+            planned.append((audio_filepath, window, [offset + shift for offset in offset_frames]))
+    print(f"Split {len(job.items)} file(s) into {len(planned)} part(s).")
+    # Swap whole lists; the timer only ever indexes the current ones
+    job.durations = [0.0] * len(planned)
+    job.file_progress = [0.0] * len(planned)
+    job.languages = languages
+    job.items = planned
+
+
+class WorkerServerConnection:
+    """Socket to the shared worker server, with the Popen attributes pump_worker_process uses."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.stdin = self
+        self.stdout = sock.makefile("r", encoding="utf-8")
+        self.writer = sock.makefile("w", encoding="utf-8")
+        self.returncode = None
+
+    def write(self, text):
+        self.writer.write(text)
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        # Half-close: the server sees EOF and finishes like a worker process would
+        self.writer.flush()
+        self.sock.shutdown(socket.SHUT_WR)
+
+    def wait(self):
+        for stream in (self.stdout, self.writer, self.sock):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        return self.returncode
+
+    def kill(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def get_worker_server_settings():
+    """(state directory, idle timeout in seconds) if the shared worker server is enabled in the preferences, else None."""
+    try:
+        prefs = bpy.context.preferences.addons[__name__].preferences
+    except (KeyError, AttributeError):
+        return None
+    if not prefs.use_worker_server:
+        return None
+    return (get_addon_cache_dir("worker_server"), prefs.worker_server_idle_minutes * 60.0)
+
+
+def start_worker_server(state_dir, idle_timeout, env):
+    kwargs = {}
+    if platform.system() == "Windows":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True # Outlives this Blender so other instances can keep using it
+    with open(os.path.join(state_dir, "server.log"), "a", encoding="utf-8") as log:
+        subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT, "--serve", state_dir, "--idle-timeout", str(idle_timeout)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+            env=env,
+            **kwargs,
+        )
+
+
+def connect_worker_server(state_dir, idle_timeout, env, timeout=30.0):
+    """Returns (socket, token) for the shared worker server, starting one if none answers. Raises OSError."""
+    deadline = time.monotonic() + timeout
+    started = False
+    while True:
+        state = whisper_worker.read_server_state(state_dir)
+        if state:
+            try:
+                sock = socket.create_connection(("127.0.0.1", state["port"]), timeout=2.0)
+                sock.settimeout(None)
+                return sock, state["token"]
+            except OSError:
+                pass # Stale state file from a server that has exited
+        if not started:
+            print("Starting the shared Whisper worker server...")
+            start_worker_server(state_dir, idle_timeout, env)
+            started = True
+        if time.monotonic() > deadline:
+            raise OSError("The shared Whisper worker server did not start. See server.log in its cache folder.")
+        time.sleep(0.2)
+
+
+def stop_worker_server(state_dir):
+    """Asks a running shared worker server to exit. Returns False if none was reachable."""
+    state = whisper_worker.read_server_state(state_dir)
+    if not state:
+        return False
+    try:
+        with socket.create_connection(("127.0.0.1", state["port"]), timeout=2.0) as sock:
+            sock.sendall((json.dumps({"token": state["token"], "shutdown": True}) + "\n").encode("utf-8"))
+    except OSError:
+        return False
+    return True
+
+
+def detect_job_languages(job, model_args, env):
+    """Fills job.languages for every item of the job, over its own clip, with one detector process."""
+    if job.cancel_event.is_set():
+        return
+    files = list(dict.fromkeys((item[0], tuple(item[1]) if item[1] else None) for item in job.items))
+    job.status = f"Detecting language of {len(files)} file(s)..."
+    config = json.dumps({
+        "model": list(model_args),
+        "model_store": job.model_store,
+        "decode_cache": job.decode_cache,
+        "language_detection": job.language_detection,
+        "files": files,
+    })
+    detected = {}
+    try:
+        proc = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT, "--detect-language", config],
+            stdout=subprocess.PIPE, text=True, encoding='utf-8', errors='replace', env=env,
+        )
+    except OSError as e:
+        print(f"Language detection failed: {e}")
+        proc = None
+    if proc is not None:
+        try:
+            for line in proc.stdout:
+                if job.cancel_event.is_set():
+                    proc.kill()
+                    break
+                result = json.loads(line)
+                audio_filepath = files[result["index"]][0]
+                if "language" in result:
+                    detected[files[result["index"]]] = result["language"]
+                    job.status = f"Detected language of '{os.path.basename(audio_filepath)}' ({len(detected)}/{len(files)})..."
+                else:
+                    print(f"Language detection failed for '{audio_filepath}': {result['error']}")
+        except (ValueError, KeyError, IndexError) as e:
+            print(f"Unexpected output from the language detection process: {e}")
+            proc.kill()
+        proc.wait()
+    if not detected:
+        # The transcription models in the workers will detect it themselves
+        job.language_detection = None
+        return
+    for index, (audio_filepath, clip, _offset_frames) in enumerate(job.items):
+        language = detected.get((audio_filepath, tuple(clip) if clip else None))
+        if language:
+            job.languages[index] = language
+
+
+def run_transcription_processes(job, model_args, transcribe_kwargs, num_workers, server=None):
+    """Coordinator thread body: fans the job's items out over a pool of worker processes.
+
+    With server=(state_dir, idle_timeout) the workers are connections to the
+    shared worker server instead, which then runs them on one warm model.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    if job.split_chunks:
+        if job.language_detection and transcribe_kwargs.get("language") is None:
+            # Once per item over its whole clip here, rather than once per chunk in every worker
+            detect_job_languages(job, model_args, env)
+        split_job_items(job, num_workers)
+    num_workers = min(num_workers, len(job.items))
+
+    pending = queue.Queue()
+    for index in range(len(job.items)):
+        pending.put(index)
+
+    model_size, device, compute_type, cpu_threads, model_workers = model_args
+    if server:
+        # One shared model serves every connection concurrently
+        model_workers = max(model_workers, num_workers)
+    elif device == 'cpu':
+        # Split the cores between processes instead of letting each one grab all of them.
+        share = max(1, (os.cpu_count() or 1) // num_workers)
+        cpu_threads = min(cpu_threads, share) if cpu_threads > 0 else share
+    config = {
+        "model": [model_size, device, compute_type, cpu_threads, model_workers],
+        "transcribe": transcribe_kwargs,
+        "cache_dir": job.cache_dir,
+        "decode_cache": job.decode_cache,
+        "checkpoint_dir": job.checkpoint_dir,
+        "model_store": job.model_store,
+        "language_detection": job.language_detection,
+    }
+
+    procs = []
+    threads = []
+    for _ in range(num_workers):
+        try:
+            if server:
+                sock, config["token"] = connect_worker_server(server[0], server[1], env)
+                proc = WorkerServerConnection(sock)
+            else:
+                proc = subprocess.Popen(
+                    [sys.executable, WORKER_SCRIPT],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    text=True,
+                    encoding='utf-8',
+                    env=env,
+                )
+            proc.stdin.write(json.dumps(config) + "\n")
+            proc.stdin.flush()
+        except Exception as e:
+            print(f"Could not start Whisper worker: {e}")
+            continue
+        thread = threading.Thread(target=pump_worker_process, args=(job, proc, pending), daemon=True)
+        thread.start()
+        procs.append(proc)
+        threads.append(thread)
+
+    while any(thread.is_alive() for thread in threads):
+        if job.cancel_event.wait(0.2):
+            for proc in procs:
+                proc.kill()
+            for thread in threads:
+                thread.join()
+            job.queue.put(("cancelled", None, None))
+            return
+
+    # Anything left over had no live worker to take it (e.g. every model load failed).
+    while True:
+        try:
+            index = pending.get_nowait()
+        except queue.Empty:
+            break
+        job.queue.put(("error", index, RuntimeError("No worker process was available to transcribe this file.")))
+    job.queue.put(("done", None, None))
+
+
+def start_transcription_job(job, model_args, transcribe_kwargs, num_workers=1):
+    global transcription_job, transcription_status_message
+    transcription_job = job
+    transcription_status_message = ""
+    if not job.split_chunks:
+        num_workers = min(num_workers, len(job.items))
+    server = get_worker_server_settings()
+    if server or num_workers > 1:
+        target = run_transcription_processes
+        args = (job, model_args, transcribe_kwargs, num_workers, server)
+    else:
+        target = run_transcription_thread
+        args = (job, model_args, get_model_cache_budget_mb(), transcribe_kwargs)
+    job.thread = threading.Thread(target=target, args=args, daemon=True)
+    job.thread.start()
+    bpy.app.timers.register(drain_transcription_job, first_interval=0.1)
+
+
+def drain_transcription_job():
+    """bpy.app.timers callback: creates strips for queued segments. Returns None once the job is over."""
+    global transcription_job, transcription_status_message
+    job = transcription_job
+    if job is None:
+        return None
+
+    scene = bpy.data.scenes.get(job.scene_name)
+    if scene is None or scene.sequence_editor is None:
+        job.cancel_event.set()
+
+    finished = None
+    channels = None # Built on the first segment of this tick
+    # Bound the work per tick so the UI stays responsive while a backlog drains.
+    for _ in range(100):
+        try:
+            kind, index, payload = job.queue.get_nowait()
+        except queue.Empty:
+            break
+
+        if kind == "info":
+            detected_lang, detected_prob, job.durations[index] = payload
+            print(f"{os.path.basename(job.items[index][0])}: detected language {detected_lang} (Confidence: {detected_prob:.2f})")
+        elif kind == "segment":
+            start_time, end_time, text, words = payload
+            job.num_segments += 1
+            if job.durations[index] > 0:
+                job.file_progress[index] = min(1.0, end_time / job.durations[index])
+            transcript_id = None
+            if words:
+                if index not in job.word_timings:
+                    job.word_timings[index] = whisper_worker.WordTimings()
+                    job.transcript_ids[index] = uuid.uuid4().hex
+                job.word_timings[index].extend(words)
+                transcript_id = job.transcript_ids[index]
+            if scene is None or scene.sequence_editor is None:
+                continue
+            if channels is None:
+                channels = ChannelIndex(scene.sequence_editor.sequences_all)
+            for offset_frame in job.items[index][2]:
+                start_frame, end_frame = segment_to_frames(start_time, end_time, job.fps, offset_frame)
+                found_channel = channels.first_free(start_frame, end_frame)
+                if not job.output_channel >= found_channel:
+                    job.output_channel = found_channel
+                print(f"  {start_time:.2f}s -> {end_time:.2f}s ({start_frame}f -> {end_frame}f): {text}")
+                try:
+                    text_strip = add_subtitle_strip(scene, text, start_frame, end_frame, job.output_channel, **job.style)
+                    if text_strip:
+                        channels.add_strip(text_strip)
+                        job.created += 1
+                        if transcript_id:
+                            tag_transcript_strip(text_strip, transcript_id, offset_frame)
+                except Exception as e_strip:
+                    print(f"  ERROR creating text strip for segment: {text} -> {e_strip}")
+        elif kind == "file_done":
+            job.file_progress[index] = 1.0
+            job.files_done += 1
+        elif kind == "error" and index is not None:
+            # One bad file should not stop the rest of the batch
+            print(f"Transcription of '{job.items[index][0]}' failed: {payload}")
+            job.failed.append(index)
+            job.file_progress[index] = 1.0
+            job.files_done += 1
+        else:
+            finished = (kind, payload)
+            break
+
+    if len(job.items) > 1:
+        unit = "part" if job.split_chunks else "file"
+        job.status = f"Transcribing {unit} {min(job.files_done + 1, len(job.items))}/{len(job.items)}..."
+    elif job.num_segments:
+        job.status = "Transcribing..."
+
+    tag_sequencer_redraw()
+    if finished is None:
+        return 0.1
+
+    kind, payload = finished
+    if kind == "error":
+        transcription_status_message = transcription_error_message(payload)
+    elif kind == "cancelled":
+        transcription_status_message = f"{job.task.capitalize()} cancelled. Added {job.created} text strips."
+    elif job.num_segments == 0 and not job.failed:
+        transcription_status_message = "No speech segments found in the audio by faster-whisper."
+    else:
+        transcription_status_message = f"{job.task.capitalize()} complete. Added {job.created} text strips."
+        if job.failed:
+            unit = "parts" if job.split_chunks else "files"
+            transcription_status_message += f" {len(job.failed)} of {len(job.items)} {unit} failed, check console."
+    print(transcription_status_message)
+    transcription_job = None
+    for index, store in job.word_timings.items():
+        try:
+            store.save(get_word_timings_path(job.transcript_ids[index]))
+        except OSError as e:
+            print(f"Could not save word timings: {e}")
+    if job.created:
+        try:
+            bpy.ops.ed.undo_push(message=f"Whisper {job.task.capitalize()}")
+        except RuntimeError:
+            pass
+    tag_sequencer_redraw()
+    return None
+
+
+def cancel_transcription_job():
+    """Stops the background job without waiting for its workers (used on unregister and file load)."""
+    global transcription_job
+    if transcription_job is not None:
+        transcription_job.cancel_event.set()
+        transcription_job = None
+    if bpy.app.timers.is_registered(drain_transcription_job):
+        bpy.app.timers.unregister(drain_transcription_job)
+
+
+def update_model_size(self, context):
+    # Switch to the auto-tuned compute type and threads for the new model, if there are any
+    tuned = get_tuned_settings(self.model_size, self.device)
+    if tuned:
+        self.compute_type = tuned["compute_type"]
+        self.cpu_threads = tuned["cpu_threads"]
+
+
 class WhisperProperties(bpy.types.PropertyGroup):
     """Properties for the Faster Whisper Addon"""
 
@@ -304,6 +1630,7 @@ class WhisperProperties(bpy.types.PropertyGroup):
             ('large-v3', 'Large v3 (~1550M)', 'Large model v3 (~1550M params)'),
         ],
         default='small',
+        update=update_model_size,
     )
 
     device: EnumProperty(
@@ -374,6 +1701,18 @@ class WhisperProperties(bpy.types.PropertyGroup):
         default='auto',
     )
 
+    language_model: EnumProperty(
+        name="Detect With",
+        description="Small model that detects the language once per audio file (cached), so the transcription model doesn't have to",
+        items=[
+            ('NONE', 'Transcription Model', 'Let the transcription model detect the language'),
+            ('tiny', 'Tiny', 'Fastest, less reliable on short or noisy audio'),
+            ('base', 'Base', 'Fast and reliable for most audio'),
+            ('small', 'Small', 'Slower, for difficult audio'),
+        ],
+        default='base',
+    )
+
     beam_size: IntProperty(
         name="Beam Size",
         description="Beam size for decoding (higher can improve accuracy but increases computation)",
@@ -387,6 +1726,106 @@ class WhisperProperties(bpy.types.PropertyGroup):
         default=True,
     )
 
+    run_in_background: BoolProperty(
+        name="Run in Background",
+        description="Transcribe on a worker thread and add text strips as segments are decoded, so Blender stays responsive",
+        default=True,
+    )
+
+    batch_workers: IntProperty(
+        name="Worker Processes",
+        description="Number of processes batch transcription spreads files across on CPU, each loading its own model (1 = reuse the model loaded in Blender)",
+        default=1,
+        min=1,
+        max=64,
+    )
+
+    use_result_cache: BoolProperty(
+        name="Cache Results",
+        description="Reuse earlier transcriptions of the same audio with the same model and decoding settings instead of running the model again",
+        default=True,
+    )
+
+    use_parallel_chunks: BoolProperty(
+        name="Split at Silences",
+        description="Cut long audio at silences found by a quick VAD pass and transcribe the parts in parallel on the worker processes",
+        default=False,
+    )
+
+    transcription_mode: EnumProperty(
+        name="Mode",
+        description="How the model decodes the audio",
+        items=[
+            ('SEQUENTIAL', 'Sequential', 'Decode one 30 second window after the other'),
+            ('BATCHED', 'Batched', 'Decode several speech chunks at once with the batched inference pipeline (more memory, much higher throughput)'),
+        ],
+        default='SEQUENTIAL',
+    )
+
+    batch_size: IntProperty(
+        name="Batch Size",
+        description="Number of speech chunks decoded together in Batched mode",
+        default=8,
+        min=1,
+        max=64,
+    )
+
+    cpu_threads: IntProperty(
+        name="CPU Threads",
+        description="Threads used by the model on CPU (0 = library default)",
+        default=0,
+        min=0,
+        max=256,
+    )
+
+    num_workers: IntProperty(
+        name="Model Workers",
+        description="Number of transcriptions a loaded model can run in parallel (more memory)",
+        default=1,
+        min=1,
+        max=16,
+    )
+
+    use_adaptive_beam: BoolProperty(
+        name="Adaptive Beam",
+        description="Decode greedily first and use the beam size only on segments the greedy pass was unsure about. Much faster, nearly as accurate",
+        default=False,
+    )
+
+    adaptive_logprob_threshold: FloatProperty(
+        name="Min Log Prob",
+        description="Re-decode segments whose average token log probability is below this",
+        default=-0.6,
+        max=0.0,
+    )
+
+    adaptive_no_speech_threshold: FloatProperty(
+        name="Max No Speech",
+        description="Re-decode segments whose no-speech probability is above this",
+        default=0.5,
+        min=0.0,
+        max=1.0,
+    )
+
+    adaptive_compression_threshold: FloatProperty(
+        name="Max Compression",
+        description="Re-decode segments whose text compresses better than this ratio (a sign of repetition)",
+        default=2.2,
+        min=1.0,
+    )
+
+    use_word_timestamps: BoolProperty(
+        name="Word Timings",
+        description="Store word-level timestamps with the transcription so the subtitles can be re-split, merged or re-timed later without running the model",
+        default=False,
+    )
+
+    use_checkpoints: BoolProperty(
+        name="Resumable",
+        description="Save finished segments to a checkpoint file next to the audio, so a cancelled or crashed transcription continues where it stopped",
+        default=True,
+    )
+
 # --- NEW Properties for Text Strips ---
     output_channel: IntProperty(
         name="Output Channel",
@@ -424,6 +1863,61 @@ class WhisperProperties(bpy.types.PropertyGroup):
     )
 
 
+def get_model_args(props):
+    """(model_size, device, compute_type, cpu_threads, num_workers) for get_whisper_model."""
+    return (props.model_size, props.device, props.compute_type, props.cpu_threads, props.num_workers)
+
+
+def get_transcribe_kwargs(props, task):
+    """Keyword arguments for WhisperModel.transcribe from the scene's WhisperProperties.
+
+    A batch_size entry selects faster-whisper's BatchedInferencePipeline (see
+    whisper_worker.transcribe).
+    """
+    # VAD default parameters are usually sensible. Can be tuned via vad_parameters=dict(...)
+    kwargs = dict(
+        language=props.language if props.language != "auto" else None, # faster-whisper uses None for auto
+        task=task,
+        beam_size=props.beam_size,
+        vad_filter=props.use_vad,
+        vad_parameters=dict(min_silence_duration_ms=500), # Example VAD tuning
+        # condition_on_previous_text=True # Helps context, default True
+    )
+    if props.use_word_timestamps:
+        # Increases computation, but lets the subtitles be re-split later without the model
+        kwargs["word_timestamps"] = True
+    if props.use_adaptive_beam and props.beam_size > 1:
+        kwargs["adaptive"] = dict(
+            log_prob_threshold=props.adaptive_logprob_threshold,
+            no_speech_threshold=props.adaptive_no_speech_threshold,
+            compression_ratio_threshold=props.adaptive_compression_threshold,
+        )
+    if props.transcription_mode == 'BATCHED':
+        kwargs["batch_size"] = props.batch_size
+        # The batched pipeline builds its batches from VAD speech chunks
+        kwargs["vad_filter"] = True
+    return kwargs
+
+
+def get_language_detection(props):
+    """language_detection argument for whisper_worker.transcribe, None unless the language is detected."""
+    if props.language != "auto" or props.language_model == 'NONE':
+        return None
+    if not whisper_worker.detector_available(props.language_model, get_model_store()):
+        print(f"Language detection model '{props.language_model}' is not in the model folder and offline mode is on. The transcription model detects the language instead.")
+        return None
+    return {"model": props.language_model, "cache_dir": get_addon_cache_dir("languages")}
+
+
+def get_subtitle_style(props):
+    """Text strip styling from the scene's WhisperProperties, as add_subtitle_strip keyword arguments."""
+    return dict(
+        font_size=props.font_size,
+        text_align_y=props.text_align_y,
+        wrap_width=props.wrap_width,
+    )
+
+
 # --- Operators ---
 
 class SEQUENCER_OT_whisper_setup(Operator):
@@ -441,8 +1935,8 @@ class SEQUENCER_OT_whisper_setup(Operator):
     def execute(self, context):
         global dependencies_checked, dependencies_installed, faster_whisper_module
 
-        # Re-check first, maybe it was installed manually since Blender started
-        if not dependencies_installed:
+        # Re-check first with a real import, maybe it was installed manually since Blender started
+        if faster_whisper_module is None:
             print("Running initial check before attempting installation...")
             check_faster_whisper()
 
@@ -450,6 +1944,8 @@ class SEQUENCER_OT_whisper_setup(Operator):
              self.report({'INFO'}, f"{REQUIRED_PACKAGE} seems to be installed.")
              # Maybe add a 'reinstall' option later if needed
              return {'FINISHED'}
+        if faster_whisper_outdated():
+            self.report({'INFO'}, f"Upgrading faster-whisper {faster_whisper_version} to {FASTER_WHISPER_VERSION}...")
 
         self.report({'INFO'}, "Attempting dependency installation...")
 
@@ -518,7 +2014,7 @@ class SEQUENCER_OT_whisper_transcribe(Operator):
     def poll(cls, context):
         if not context.scene:
             return False
-        if not dependencies_installed or faster_whisper_module is None:
+        if not dependencies_installed:
              # Disable if not installed (check is cheap)
              cls.poll_message_set("Dependencies not installed. Run 'Install/Verify Dependencies'.")
              return False
@@ -532,6 +2028,9 @@ class SEQUENCER_OT_whisper_transcribe(Operator):
              return False
         if not s.type =="SOUND":
              return False
+        if transcription_job is not None:
+             cls.poll_message_set("A background transcription is already running.")
+             return False
         return True
 
 
@@ -541,11 +2040,8 @@ class SEQUENCER_OT_whisper_transcribe(Operator):
         props = scene.whisper_props # Access properties via the property group
 
         # --- Dependency Check ---
-        if not dependencies_checked:
-            check_faster_whisper() # Check silently if setup wasn't run
-            dependencies_checked = True
-
-        if not dependencies_installed or faster_whisper_module is None:
+        # The heavy import happens here, on first use, instead of at startup
+        if get_faster_whisper() is None:
             self.report({'ERROR'}, f"{REQUIRED_PACKAGE} not installed. Please run '{SEQUENCER_OT_whisper_setup.bl_label}'.")
             # Consider showing a popup:
             # bpy.ops.wm.call_confirm_popup(message=f"Please run '{SEQUENCER_OT_whisper_setup.bl_label}' first.")
@@ -557,80 +2053,73 @@ class SEQUENCER_OT_whisper_transcribe(Operator):
             self.report({'ERROR'}, "No valid audio strip selected.")
             return {'CANCELLED'}
 
-        try:
-            if not strip.sound or not strip.sound.filepath:
-                 self.report({'ERROR'}, f"Audio strip '{strip.name}' missing sound data or filepath.")
-                 return {'CANCELLED'}
-
-            audio_filepath = bpy.path.abspath(strip.sound.filepath) # Get path once
-
-            if not os.path.exists(audio_filepath): # Check existence once
-                self.report({'ERROR'}, f"Audio file not found: {audio_filepath}")
-                return {'CANCELLED'}
-        except Exception as e:
-             self.report({'ERROR'}, f"Error accessing audio filepath for '{strip.name}': {e}")
-             import traceback
-             traceback.print_exc()
-             return {'CANCELLED'}
-
-        allowed_extensions = {'.wav', '.mp3', '.ogg', '.flac', '.m4a', '.aac', '.wma', '.opus'} # Add more if needed
-        _ , file_extension = os.path.splitext(audio_filepath)
-        if file_extension.lower() not in allowed_extensions:
-             # Specifically check for .blend
-             if file_extension.lower() == '.blend':
-                  error_msg = (f"The source path for the audio strip points to a '.blend' file ({os.path.basename(audio_filepath)}), "
-                               f"not an audio file. Please correct the strip's 'File Path' in Blender's properties panel "
-                               f"or unpack the audio if it was packed.")
-             else:
-                  error_msg = (f"The source file ('{os.path.basename(audio_filepath)}') does not appear to be a supported audio format. "
-                               f"Supported types include: {', '.join(allowed_extensions)}. "
-                               f"Please check the strip's 'File Path' in Blender.")
-             self.report({'ERROR'}, error_msg)
-             return {'CANCELLED'}
+        audio_filepath, error_msg = resolve_strip_audio(strip)
+        if not audio_filepath:
+            self.report({'ERROR'}, error_msg)
+            return {'CANCELLED'}
 
         # Get properties from scene property group
         model_size = props.model_size
         device = props.device
         compute_type = props.compute_type
         language_code = props.language if props.language != "auto" else None # faster-whisper uses None for auto
-        beam_size = props.beam_size
-        use_vad = props.use_vad
         current_task = self.task # "transcribe" or "translate"
 
-        strip_start_frame = strip.frame_start
         fps = scene.render.fps / scene.render.fps_base
         if fps <= 0:
              self.report({'ERROR'}, "Scene FPS must be positive.")
              return {'CANCELLED'}
+        # Only the trimmed, visible part of the strip is transcribed
+        clip, strip_start_frame = get_strip_audio_window(strip, fps)
 
-        # --- Load Model and Transcribe ---
-        try:
-            # Access the already imported module's class
-            WhisperModel = faster_whisper_module.WhisperModel
+        # Get settings for text strips (do this *before* transcribing)
+        output_channel = props.output_channel
+        style = get_subtitle_style(props)
+        transcribe_kwargs = get_transcribe_kwargs(props, current_task)
 
-            print(f"Loading faster-whisper model: {model_size} (Device: {device}, Compute: {compute_type})")
-            self.report({'INFO'}, f"Loading model '{model_size}'... (May download first time)")
-            bpy.context.window_manager.windows.update() # Force redraw
+        # Splitting at silences fans one file out over the worker processes (CPU only)
+        num_workers = props.batch_workers if device == 'cpu' else 1
+        split_chunks = props.use_parallel_chunks and num_workers > 1
 
-            # Check if model exists locally, potentially estimate download size/time? (Advanced)
+        preflight_items = [(audio_filepath, clip, strip.frame_final_duration / fps)]
+        if not preflight_check(self, props, preflight_items, transcribe_kwargs, num_workers if split_chunks else 1):
+            return {'CANCELLED'}
 
-            model = WhisperModel(model_size, device=device, compute_type=compute_type)
+        # --- Background Mode: worker thread + timer draining segments into strips ---
+        if props.run_in_background or split_chunks or get_worker_server_settings():
+            if transcription_job is not None:
+                self.report({'ERROR'}, "A background transcription is already running.")
+                return {'CANCELLED'}
+            job = TranscriptionJob(
+                scene.name, [(audio_filepath, clip, [strip_start_frame])], current_task, fps, output_channel, style,
+                cache_dir=get_result_cache_dir(props), decode_cache=get_decode_cache(), model_store=get_model_store(),
+                language_detection=get_language_detection(props),
+                checkpoint_dir=get_checkpoint_dir(props), split_chunks=split_chunks,
+            )
+            start_transcription_job(job, get_model_args(props), transcribe_kwargs, num_workers=num_workers)
+            self.report({'INFO'}, f"Transcribing '{os.path.basename(audio_filepath)}' in the background (Task: {current_task})...")
+            return {'FINISHED'}
+
+        # --- Load Model and Transcribe ---
+        try:
+            def get_model(detector_size=None):
+                # Only called when the result cache has no entry for these settings
+                model_args = get_model_args(props)
+                if detector_size is not None:
+                    model_args = whisper_worker.detector_config(model_args, detector_size)
+                print(f"Loading faster-whisper model: {model_args[0]} (Device: {device}, Compute: {model_args[2]})")
+                self.report({'INFO'}, f"Loading model '{model_args[0]}'... (May download first time)")
+                bpy.context.window_manager.windows.update() # Force redraw
+                return get_whisper_model(*model_args)
 
             print(f"Starting transcription...")
             self.report({'INFO'}, f"Transcribing '{os.path.basename(audio_filepath)}' (Task: {current_task})...")
             bpy.context.window_manager.progress_begin(0, 100)
 
             # Faster-whisper transcribe yields segments
-            # VAD default parameters are usually sensible. Can be tuned via vad_parameters=dict(...)
-            segments, info = model.transcribe(
-                audio=audio_filepath,
-                language=language_code,
-                task=current_task,
-                beam_size=beam_size,
-                vad_filter=use_vad,
-                vad_parameters=dict(min_silence_duration_ms=500), # Example VAD tuning
-                # word_timestamps=False, # Set True if needed, increases computation significantly
-                # condition_on_previous_text=True # Helps context, default True
+            segments, info = whisper_worker.transcribe(
+                get_model, audio_filepath, clip, [model_size, compute_type], transcribe_kwargs,
+                get_result_cache_dir(props), get_decode_cache(), get_checkpoint_dir(props), get_language_detection(props),
             )
 
             detected_lang = info.language
@@ -694,194 +2183,673 @@ class SEQUENCER_OT_whisper_transcribe(Operator):
                      print(f"Detected language '{detected_lang}' is not in the predefined EnumProperty items. UI not updated.")
 
 
-            # --- Process Segments ---
-            print("Processing segments...")
-
-            # Get settings for text strips (do this *before* the loop)
-            output_channel = props.output_channel
-            font_size = props.font_size
-            text_align_y = props.text_align_y
-            wrap_width = props.wrap_width
-            render_width = scene.render.resolution_x
-
-            # Consume the segments generator INTO a list to allow counting and progress
-            # Note: This uses more memory for very long transcriptions.
-            # An alternative is to iterate directly and estimate progress.
+            # --- Process Segments ---
+            # Iterate the generator directly: strips are created as segments are decoded,
+            # and progress is measured against the audio duration instead of a segment count.
+            print(f"Adding text strips from channel {output_channel}...")
+            duration = info.duration or 0.0
+            word_timings = whisper_worker.WordTimings()
+            transcript_id = uuid.uuid4().hex
+            created_strips_count = 0
+            num_segments = 0
+            last_progress_update = -1 # Ensure first update
+            channels = ChannelIndex(scene.sequence_editor.sequences_all)
+
+            for segment in segments:
+                num_segments += 1
+                text = segment.text.strip()
+                start_frame, end_frame = segment_to_frames(segment.start, segment.end, fps, strip_start_frame)
+
+                found_channel = channels.first_free(start_frame, end_frame)
+                if not output_channel >= found_channel:
+                    output_channel = found_channel
+
+                print(f"  {segment.start:.2f}s -> {segment.end:.2f}s ({start_frame}f -> {end_frame}f): {text}")
+
+                words = whisper_worker.segment_words(segment)
+                word_timings.extend(words)
+
+                # --- Create the Text Strip ---
+                try:
+                    text_strip = add_subtitle_strip(scene, text, start_frame, end_frame, output_channel, **style)
+                    if text_strip:
+                        channels.add_strip(text_strip)
+                        created_strips_count += 1
+                        if words:
+                            tag_transcript_strip(text_strip, transcript_id, strip_start_frame)
+                    else:
+                        print(f"  ERROR: new_effect call returned None for segment: {text}")
+                except Exception as e_strip:
+                     print(f"  ERROR creating text strip for segment: {text} -> {e_strip}")
+                     import traceback
+                     traceback.print_exc()
+
+                # Update progress based on how far into the audio the decoder is
+                if duration > 0:
+                    progress = min(100, int(segment.end / duration * 100))
+                    if progress > last_progress_update:
+                        bpy.context.window_manager.progress_update(progress)
+                        last_progress_update = progress
+                # Allow UI refresh occasionally
+                if num_segments % 50 == 0:
+                      bpy.context.window_manager.windows.update()
+
+            bpy.context.window_manager.progress_end()
+            if len(word_timings):
+                word_timings.save(get_word_timings_path(transcript_id))
+            if num_segments == 0:
+                self.report({'WARNING'}, "No speech segments found in the audio by faster-whisper.")
+                return {'FINISHED'} # Exit cleanly if transcription returned nothing
+            if created_strips_count > 0:
+                # Report success based on actual strips created
+                self.report({'INFO'}, f"{current_task.capitalize()} complete. Added {created_strips_count} text strips to channel {output_channel}.")
+            else:
+                # Segments were found by whisper, but strip creation failed for all
+                 self.report({'ERROR'}, f"{current_task.capitalize()} finished. Whisper found {num_segments} segments, but failed to create text strips. Check console.")
+
+        except ImportError:
+             # Should be caught by initial check, but safeguard
+             self.report({'ERROR'}, "Faster-Whisper module gone missing. Please Setup again or restart Blender.")
+             bpy.context.window_manager.progress_end()
+             return {'CANCELLED'}
+        except Exception as e:
+            bpy.context.window_manager.progress_end()
+            print(f"An error occurred during transcription: {e}")
+            import traceback
+            traceback.print_exc() # Print detailed traceback to Blender System Console
+            self.report({'ERROR'}, transcription_error_message(e))
+            return {'CANCELLED'}
+
+        return {'FINISHED'}
+
+
+class SEQUENCER_OT_whisper_transcribe_batch(Operator):
+    """Transcribes all selected audio strips into Text Strips in the background, one model for the whole queue"""
+    bl_idname = "sequencer.whisper_transcribe_batch"
+    bl_label = "Batch Transcribe Selected Strips"
+    bl_options = {'REGISTER'}
+
+    task: StringProperty(default="transcribe") # "transcribe" or "translate"
+
+    @classmethod
+    def poll(cls, context):
+        if not context.scene:
+            return False
+        if not dependencies_installed:
+             cls.poll_message_set("Dependencies not installed. Run 'Install/Verify Dependencies'.")
+             return False
+        if transcription_job is not None:
+             cls.poll_message_set("A background transcription is already running.")
+             return False
+        if not get_selected_sound_strips(context):
+             cls.poll_message_set("Select one or more audio strips first.")
+             return False
+        return True
+
+    def execute(self, context):
+        scene = context.scene
+        props = scene.whisper_props
+
+        fps = scene.render.fps / scene.render.fps_base
+        if fps <= 0:
+             self.report({'ERROR'}, "Scene FPS must be positive.")
+             return {'CANCELLED'}
+
+        num_workers = props.batch_workers if props.device == 'cpu' else 1
+
+        # Group strips by resolved file so each file is transcribed only once
+        items = {}
+        durations = {}
+        skipped = 0
+        for strip in sorted(get_selected_sound_strips(context), key=lambda s: s.frame_start):
+            audio_filepath, error_msg = resolve_strip_audio(strip)
+            if not audio_filepath:
+                print(f"Skipping '{strip.name}': {error_msg}")
+                skipped += 1
+                continue
+            clip, offset_frame = get_strip_audio_window(strip, fps)
+            key = (os.path.normcase(os.path.realpath(audio_filepath)), clip)
+            items.setdefault(key, (audio_filepath, clip, []))[2].append(offset_frame)
+            durations.setdefault(key, (audio_filepath, clip, strip.frame_final_duration / fps))
+
+        if not items:
+            self.report({'ERROR'}, "None of the selected audio strips point to a supported audio file. Check console.")
+            return {'CANCELLED'}
+        split_chunks = props.use_parallel_chunks and num_workers > 1
+        processes = num_workers if split_chunks else min(num_workers, len(items))
+        transcribe_kwargs = get_transcribe_kwargs(props, self.task)
+        if not preflight_check(self, props, list(durations.values()), transcribe_kwargs, processes):
+            return {'CANCELLED'}
+
+        job = TranscriptionJob(
+            scene.name, list(items.values()), self.task, fps, props.output_channel, get_subtitle_style(props),
+            cache_dir=get_result_cache_dir(props), decode_cache=get_decode_cache(), model_store=get_model_store(),
+            language_detection=get_language_detection(props),
+            checkpoint_dir=get_checkpoint_dir(props), split_chunks=split_chunks,
+        )
+        start_transcription_job(
+            job,
+            get_model_args(props),
+            transcribe_kwargs,
+            num_workers=num_workers,
+        )
+        message = f"Queued {len(job.items)} audio file(s) for {self.task}"
+        if skipped:
+            message += f", skipped {skipped} strip(s) (see console)"
+        self.report({'INFO'}, message + ".")
+        return {'FINISHED'}
+
+
+class SEQUENCER_OT_whisper_resplit(Operator):
+    """Rebuilds the active strip's transcription as new subtitles from its stored word timings"""
+    bl_idname = "sequencer.whisper_resplit"
+    bl_label = "Re-split Subtitles"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    max_chars: IntProperty(
+        name="Max Characters",
+        description="Longest subtitle line",
+        default=42,
+        min=5,
+    )
+    max_duration: FloatProperty(
+        name="Max Duration",
+        description="Longest time a subtitle stays on screen (seconds)",
+        default=6.0,
+        min=0.5,
+    )
+    max_gap: FloatProperty(
+        name="Max Pause",
+        description="Start a new subtitle after a pause longer than this (seconds)",
+        default=0.8,
+        min=0.0,
+    )
+
+    @classmethod
+    def poll(cls, context):
+        editor = context.scene.sequence_editor if context.scene else None
+        active = editor.active_strip if editor else None
+        if not active or active.type != 'TEXT' or not active.get("whisper_transcript"):
+            cls.poll_message_set("Select a subtitle transcribed with Word Timings enabled.")
+            return False
+        return True
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        scene = context.scene
+        active = scene.sequence_editor.active_strip
+        transcript_id = active["whisper_transcript"]
+        offset_frame = active.get("whisper_offset", 0.0)
+        try:
+            word_timings = whisper_worker.WordTimings.load(get_word_timings_path(transcript_id))
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Word timings for this transcription are missing: {e}")
+            return {'CANCELLED'}
+
+        fps = scene.render.fps / scene.render.fps_base
+        channel = active.channel
+        style = dict(font_size=active.font_size, text_align_y=active.anchor_y, wrap_width=active.wrap_width)
+
+        # Replace every strip of this transcript placement
+        strips = scene.sequence_editor.sequences
+        for strip in [
+            s for s in strips
+            if s.get("whisper_transcript") == transcript_id and abs(s.get("whisper_offset", 0.0) - offset_frame) < 0.01
+        ]:
+            strips.remove(strip)
+
+        created = 0
+        channels = ChannelIndex(scene.sequence_editor.sequences_all)
+        for start_time, end_time, text in word_timings.resegment(self.max_chars, self.max_duration, self.max_gap):
+            start_frame, end_frame = segment_to_frames(start_time, end_time, fps, offset_frame)
+            found_channel = channels.first_free(start_frame, end_frame)
+            text_strip = add_subtitle_strip(scene, text, start_frame, end_frame, max(channel, found_channel), **style)
+            if text_strip:
+                channels.add_strip(text_strip)
+                tag_transcript_strip(text_strip, transcript_id, offset_frame)
+                created += 1
+
+        bpy.ops.text.refresh_list()
+        self.report({'INFO'}, f"Re-split into {created} subtitles from {len(word_timings)} words.")
+        return {'FINISHED'}
+
+
+class SEQUENCER_OT_whisper_cancel(Operator):
+    """Cancels the running background transcription"""
+    bl_idname = "sequencer.whisper_cancel"
+    bl_label = "Cancel Transcription"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    @classmethod
+    def poll(cls, context):
+        return transcription_job is not None
+
+    def execute(self, context):
+        transcription_job.cancel_event.set()
+        transcription_job.status = "Cancelling..."
+        self.report({'INFO'}, "Cancelling transcription after the current segment...")
+        return {'FINISHED'}
+
+
+class SEQUENCER_OT_whisper_unload_models(Operator):
+    """Unloads all cached Faster Whisper models to free memory"""
+    bl_idname = "sequencer.whisper_unload_models"
+    bl_label = "Unload Models"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    @classmethod
+    def poll(cls, context):
+        return len(whisper_model_cache) > 0 or openai_whisper_model is not None
+
+    def execute(self, context):
+        count = unload_whisper_models()
+        self.report({'INFO'}, f"Unloaded {count} cached model(s).")
+        return {'FINISHED'}
+
+
+# The running or last AutoTuneTask, shown in the Whisper panel.
+autotune_task = None
+
+
+def autotune_candidates(device):
+    """(compute_type, cpu_threads) pairs worth comparing on this machine."""
+    if device == 'cuda':
+        return [('float16', 0), ('int8_float16', 0), ('int8', 0)]
+    cores = os.cpu_count() or 1
+    threads = sorted({max(1, cores // 2), cores, min(cores, 4)})
+    return [(compute_type, n) for compute_type in ('int8', 'float32') for n in threads]
+
+
+class AutoTuneTask:
+    """Benchmarks each candidate configuration in its own worker process (see whisper_worker.run_benchmark)."""
+
+    def __init__(self, scene_name, model_size, device, beam_size, model_store):
+        self.scene_name = scene_name
+        self.model_size = model_size
+        self.device = device
+        self.beam_size = beam_size
+        self.model_store = model_store
+        self.candidates = autotune_candidates(device)
+        self.results = [] # (compute_type, cpu_threads, result dict)
+        self.status = "Starting..."
+        self.done = False
+        self.cancel_event = threading.Event()
+        self.env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        for index, (compute_type, cpu_threads) in enumerate(self.candidates):
+            if self.cancel_event.is_set():
+                break
+            self.status = f"Benchmarking {compute_type}, {cpu_threads or 'default'} threads ({index + 1}/{len(self.candidates)})..."
+            config = json.dumps({
+                "model": [self.model_size, self.device, compute_type, cpu_threads, 1],
+                "model_store": self.model_store,
+                "beam_size": self.beam_size,
+            })
             try:
-                segments_list = list(segments)
-                num_segments = len(segments_list)
-            except Exception as e_consume:
-                self.report({'ERROR'}, f"Error processing transcription segments: {e_consume}")
-                bpy.context.window_manager.progress_end()
-                return {'CANCELLED'}
+                proc = subprocess.run(
+                    [sys.executable, WORKER_SCRIPT, "--benchmark", config],
+                    capture_output=True, text=True, encoding='utf-8', errors='replace', env=self.env, timeout=1800,
+                )
+                lines = proc.stdout.strip().splitlines()
+                result = json.loads(lines[-1]) if lines else {"error": f"Benchmark process exited with code {proc.returncode}."}
+            except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+                result = {"error": str(e)}
+            print(f"Auto-tune {self.model_size} {compute_type} x{cpu_threads}: {result}")
+            self.results.append((compute_type, cpu_threads, result))
+        self.done = True
+
+
+def finish_autotune(task):
+    """Records the task's runs and applies the fastest one to its scene. Returns a status message."""
+    history = get_benchmark_history()
+    best = None
+    for compute_type, cpu_threads, result in task.results:
+        if "error" in result:
+            continue
+        run = dict(
+            model_size=task.model_size, device=task.device, compute_type=compute_type, cpu_threads=cpu_threads,
+            rtf=result["rtf"], peak_mb=result["peak_mb"], load_seconds=result["load_seconds"], time=time.time(),
+        )
+        history["runs"].append(run)
+        if best is None or run["rtf"] < best["rtf"]:
+            best = run
+    if best is None:
+        return f"Auto-tune found no working configuration for '{task.model_size}'. See the console."
+    history["best"].setdefault(task.model_size, {})[task.device] = best
+    save_benchmark_history()
+
+    scene = bpy.data.scenes.get(task.scene_name)
+    if scene is not None:
+        props = scene.whisper_props
+        if props.model_size == task.model_size and props.device == task.device:
+            props.compute_type = best["compute_type"]
+            props.cpu_threads = best["cpu_threads"]
+    return f"Fastest: {best['compute_type']}, {best['cpu_threads'] or 'default'} threads (RTF {best['rtf']:.2f}, {best['peak_mb']:.0f} MB)."
+
+
+def watch_autotune_task():
+    """bpy.app.timers callback: shows the benchmark progress and records the results once done."""
+    global autotune_task, transcription_status_message
+    tag_sequencer_redraw()
+    task = autotune_task
+    if task is None:
+        return None
+    if not task.done:
+        return 0.5
+    autotune_task = None
+    transcription_status_message = finish_autotune(task)
+    print(transcription_status_message)
+    tag_sequencer_redraw()
+    return None
 
-            if num_segments == 0:
-                self.report({'WARNING'}, "No speech segments found in the audio by faster-whisper.")
-                bpy.context.window_manager.progress_end()
-                return {'FINISHED'} # Exit cleanly if transcription returned nothing
 
-            print(f"Adding {num_segments} text strips to channel {output_channel}...")
+class SEQUENCER_OT_whisper_autotune(Operator):
+    """Benchmarks compute types and thread counts for the selected model on this machine and picks the fastest"""
+    bl_idname = "sequencer.whisper_autotune"
+    bl_label = "Auto-tune"
+    bl_options = {'REGISTER', 'INTERNAL'}
 
-            # --- Process Segments and Create Text Strips ---
-            created_strips_count = 0
-            last_progress_update = -1 # Ensure first update
+    @classmethod
+    def poll(cls, context):
+        if autotune_task is not None:
+            cls.poll_message_set("Auto-tune is already running.")
+            return False
+        if transcription_job is not None:
+            cls.poll_message_set("A background transcription is running.")
+            return False
+        return dependencies_installed
 
-            # NOW iterate over the POPULATED segments_list
-            for i, segment in enumerate(segments_list):
-                start_time = segment.start
-                end_time = segment.end
-                text = segment.text.strip()
+    def execute(self, context):
+        global autotune_task
+        props = context.scene.whisper_props
+        autotune_task = AutoTuneTask(context.scene.name, props.model_size, props.device, props.beam_size, get_model_store())
+        autotune_task.thread.start()
+        bpy.app.timers.register(watch_autotune_task, first_interval=0.5)
+        self.report({'INFO'}, f"Benchmarking {len(autotune_task.candidates)} configurations of '{props.model_size}'...")
+        return {'FINISHED'}
 
-                # Calculate frame numbers
-                start_frame_calc = round(start_time * fps) + strip_start_frame
-                end_frame_calc = round(end_time * fps) + strip_start_frame
 
-                # Explicitly cast to int
-                start_frame = int(start_frame_calc)
-                end_frame = int(end_frame_calc)
-                
-                found_channel = find_first_empty_channel(start_frame,end_frame)
-                if not output_channel >= found_channel:
-                    output_channel = found_channel  
+class SEQUENCER_OT_whisper_autotune_cancel(Operator):
+    """Stops auto-tune after the configuration being benchmarked"""
+    bl_idname = "sequencer.whisper_autotune_cancel"
+    bl_label = "Cancel Auto-tune"
+    bl_options = {'REGISTER', 'INTERNAL'}
 
-                # Ensure minimum duration of 1 frame
-                if end_frame <= start_frame:
-                    end_frame = start_frame + 1
+    @classmethod
+    def poll(cls, context):
+        return autotune_task is not None
 
-                print(f"  {start_time:.2f}s -> {end_time:.2f}s ({start_frame}f -> {end_frame}f): {text}")
+    def execute(self, context):
+        autotune_task.cancel_event.set()
+        return {'FINISHED'}
 
-                # --- Create the Text Strip ---
-                try:
-                    text_strip = scene.sequence_editor.sequences.new_effect(
-                        name=f"Sub_{start_frame}",
-                        type='TEXT',
-                        channel=output_channel,
-                        frame_start=start_frame,
-                        frame_end=end_frame
-                    )
 
-                    if text_strip:
-                        # Set text content
-                        text_strip.text = text
-
-                        # Set appearance properties
-                        text_strip.font_size = font_size
-                        text_strip.anchor_y = text_align_y
-                        text_strip.anchor_x = 'CENTER'
-
-                        # Adjust vertical position slightly
-                        if text_align_y == 'BOTTOM':
-                            text_strip.location[1] = 0.05
-                        elif text_align_y == 'TOP':
-                            text_strip.location[1] = 1.0 - 0.05 - (text_strip.font_size / scene.render.resolution_y)
-                        else: # CENTER
-                             text_strip.location[1] = 0.5
-
-                        # Set wrapping
-                        if wrap_width > 0:
-                            text_strip.wrap_width = wrap_width
-                        else:
-                            text_strip.wrap_width = 0
-
-                        # Set other useful defaults
-                        text_strip.use_shadow = True
-                        text_strip.shadow_color = (0, 0, 0, 1)
+# The running or last ModelStoreTask, shown in the preferences.
+model_store_task = None
 
-                        created_strips_count += 1
-                    else:
-                         print(f"  ERROR: new_effect call returned None for segment: {text}")
 
-                except Exception as e_strip:
-                     print(f"  ERROR creating text strip for segment: {text} -> {e_strip}")
-                     import traceback
-                     traceback.print_exc()
+class ModelStoreTask:
+    """Downloads or verifies models of the local store in a worker thread."""
 
-                # Update progress based on segment index
-                progress = int(((i + 1) / num_segments) * 100)
-                if progress > last_progress_update:
-                    bpy.context.window_manager.progress_update(progress)
-                    last_progress_update = progress
-                # Allow UI refresh occasionally
-                if i % 50 == 0:
-                      bpy.context.window_manager.windows.update()
+    def __init__(self, model_dir, prefetch=(), verify=()):
+        self.model_dir = model_dir
+        self.prefetch = list(prefetch)
+        self.verify = list(verify)
+        self.status = "Starting..."
+        self.done = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
 
-            # End of loop for segments_list
+    def run(self):
+        results = []
+        for model_size in self.prefetch:
+            self.status = f"Downloading '{model_size}'..."
+            try:
+                whisper_worker.prefetch_model(model_size, self.model_dir)
+                results.append(f"{model_size}: downloaded")
+            except Exception as e:
+                results.append(f"{model_size}: download failed ({e})")
+        for model_size in self.verify:
+            self.status = f"Verifying '{model_size}'..."
+            path = whisper_worker.local_model_path(self.model_dir, model_size)
+            try:
+                problem = whisper_worker.verify_model(path, full=True)
+                if problem and problem.startswith("no manifest"):
+                    # Copied in by hand: trust what is there now and guard it from here on
+                    whisper_worker.write_model_manifest(path)
+                    problem = whisper_worker.verify_model(path, full=True)
+            except Exception as e:
+                problem = str(e)
+            results.append(f"{model_size}: {problem or 'OK'}")
+        for line in results:
+            print(f"Model store: {line}")
+        self.status = "; ".join(results) or "Nothing to do."
+        self.done = True
+
+
+def watch_model_store_task():
+    """bpy.app.timers callback redrawing the preferences while a ModelStoreTask runs."""
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'PREFERENCES':
+                area.tag_redraw()
+    return None if model_store_task is None or model_store_task.done else 0.5
+
+
+def start_model_store_task(task):
+    global model_store_task
+    model_store_task = task
+    task.thread.start()
+    bpy.app.timers.register(watch_model_store_task, first_interval=0.5)
+
+
+class SEQUENCER_OT_whisper_prefetch_model(Operator):
+    """Downloads the scene's Faster Whisper model into the local model folder, for use without network access"""
+    bl_idname = "sequencer.whisper_prefetch_model"
+    bl_label = "Prefetch Model"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    model_size: StringProperty(name="Model", description="Model to download; empty uses the scene's model size", default="")
 
-            bpy.context.window_manager.progress_end()
-            if created_strips_count > 0:
-                # Report success based on actual strips created
-                self.report({'INFO'}, f"{current_task.capitalize()} complete. Added {created_strips_count} text strips to channel {output_channel}.")
-            elif num_segments > 0:
-                # Segments were found by whisper, but strip creation failed for all
-                 self.report({'ERROR'}, f"{current_task.capitalize()} finished. Whisper found {num_segments} segments, but failed to create text strips. Check console.")
-            else:
-                # This case should be caught earlier, but as a fallback
-                 self.report({'WARNING'}, f"{current_task.capitalize()} finished, but no segments found or created. Check console.")
+    @classmethod
+    def poll(cls, context):
+        return model_store_task is None or model_store_task.done
 
-        except ImportError:
-             # Should be caught by initial check, but safeguard
-             self.report({'ERROR'}, "Faster-Whisper module gone missing. Please Setup again or restart Blender.")
-             bpy.context.window_manager.progress_end()
-             return {'CANCELLED'}
-        except Exception as e:
-            bpy.context.window_manager.progress_end()
-            error_message = f"An error occurred during transcription: {e}"
-            print(error_message)
-            import traceback
-            traceback.print_exc() # Print detailed traceback to Blender System Console
-            # Try to provide a more specific common error message
-            if "ffmpeg" in str(e).lower():
-                 report_msg = "Transcription failed. Ensure FFmpeg is installed and in system PATH. Check Console."
-            elif "cuda" in str(e).lower() or "nvtx" in str(e).lower() or "cublas" in str(e).lower():
-                 report_msg = "CUDA error. Ensure GPU drivers & CUDA Toolkit are installed correctly. Try CPU device. Check Console."
-            elif "memory" in str(e).lower():
-                 report_msg = "Out of memory error. Try a smaller model, 'int8' compute type, or increase system RAM/VRAM. Check Console."
-            else:
-                 report_msg = "Transcription failed. Check Blender System Console for details."
-            self.report({'ERROR'}, report_msg)
+    def execute(self, context):
+        if get_faster_whisper() is None:
+            self.report({'ERROR'}, f"{REQUIRED_PACKAGE} not installed. Please run '{SEQUENCER_OT_whisper_setup.bl_label}'.")
+            return {'CANCELLED'}
+        model_size = self.model_size or context.scene.whisper_props.model_size
+        model_dir, _offline = get_model_store()
+        start_model_store_task(ModelStoreTask(model_dir, prefetch=[model_size]))
+        self.report({'INFO'}, f"Downloading '{model_size}' to {model_dir}...")
+        return {'FINISHED'}
+
+
+class SEQUENCER_OT_whisper_verify_models(Operator):
+    """Checks the checksums of every model in the local model folder"""
+    bl_idname = "sequencer.whisper_verify_models"
+    bl_label = "Verify Models"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    @classmethod
+    def poll(cls, context):
+        return model_store_task is None or model_store_task.done
+
+    def execute(self, context):
+        model_dir, _offline = get_model_store()
+        if not os.path.isdir(model_dir):
+            self.report({'ERROR'}, f"Model folder {model_dir} does not exist.")
+            return {'CANCELLED'}
+        try:
+            models = sorted(entry.name for entry in os.scandir(model_dir) if entry.is_dir())
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not read model folder {model_dir}: {e}")
             return {'CANCELLED'}
+        if not models:
+            self.report({'INFO'}, f"No models in {model_dir}.")
+            return {'CANCELLED'}
+        start_model_store_task(ModelStoreTask(model_dir, verify=models))
+        self.report({'INFO'}, f"Verifying {len(models)} model(s)...")
+        return {'FINISHED'}
+
+
+class SEQUENCER_OT_whisper_stop_server(Operator):
+    """Stops the shared Whisper worker server and frees the models it holds"""
+    bl_idname = "sequencer.whisper_stop_server"
+    bl_label = "Stop Worker Server"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    def execute(self, context):
+        if stop_worker_server(get_addon_cache_dir("worker_server")):
+            self.report({'INFO'}, "Stopping the shared worker server.")
+        else:
+            self.report({'INFO'}, "No shared worker server is running.")
+        return {'FINISHED'}
+
+
+class SEQUENCER_OT_whisper_clear_cache(Operator):
+    """Deletes all cached transcription results, decoded audio, detected languages and word timings (subtitles can't be re-split afterwards)"""
+    bl_idname = "sequencer.whisper_clear_cache"
+    bl_label = "Clear Transcription Cache"
+    bl_options = {'REGISTER', 'INTERNAL'}
 
+    def execute(self, context):
+        count = 0
+        for name in ("transcriptions", "decoded_audio", "languages", "word_timings"):
+            for entry in os.scandir(get_addon_cache_dir(name)):
+                if entry.is_file():
+                    try:
+                        os.remove(entry.path)
+                        count += 1
+                    except OSError as e:
+                        print(f"Could not remove {entry.path}: {e}")
+        self.report({'INFO'}, f"Removed {count} cached file(s).")
         return {'FINISHED'}
 
 
-def import_module(self, module, install_module):
-    show_system_console(True)
-    set_system_console_topmost(True)
-    module = str(module)
+# --- Python Module Resolver ---
+
+# Modules that imported fine this session; they are never looked up again.
+resolved_modules = set()
+# Optional modules whose install failed; not tried again this session.
+unavailable_modules = set()
+# module name -> ModuleInstall, for pip installs running in the background
+module_installs = {}
+module_paths_added = False
+
 
+def ensure_module_paths():
+    """Puts the site-packages folders pip installs into on sys.path, once per session."""
+    global module_paths_added
+    if module_paths_added:
+        return
     # Get the path of the Python executable (e.g., python.exe)
     python_exe_dir = os.path.dirname(os.__file__)
     # Construct the path to the site-packages directory
-    #site_packages_dir = os.path.join(python_exe_dir, 'lib', 'site-packages')
-    site_packages_dir = os.path.join(python_exe_dir, 'lib', 'site-packages') if os.name == 'nt' else os.path.join(python_exe_dir, 'lib', 'python3.x', 'site-packages')        
+    site_packages_dir = os.path.join(python_exe_dir, 'lib', 'site-packages') if os.name == 'nt' else os.path.join(python_exe_dir, 'lib', 'python3.x', 'site-packages')
     # Add the site-packages directory to the top of sys.path
-    sys.path.insert(0, site_packages_dir)
-    
-    #def ensure_pip(self):
+    if site_packages_dir not in sys.path:
+        sys.path.insert(0, site_packages_dir)
     app_path = site.USER_SITE
-    if app_path not in sys.path:
+    if app_path and app_path not in sys.path:
         sys.path.append(app_path)
-    pybin = sys.executable
+    module_paths_added = True
 
-    try:
-        exec("import " + module)
-    except ModuleNotFoundError:
-        app_path = site.USER_SITE
-        if app_path not in sys.path:
-            sys.path.append(app_path)
-        pybin = sys.executable
 
-        self.report({"INFO"}, "Installing: " + module + " module.")
-        print("Installing: " + module + " module")
-        subprocess.call([pybin, "-m", "pip", "install", install_module, "--no-warn-script-location"]) #"--user",  , '--target', site_packages_dir
+class ModuleInstall:
+    """A pip install running in a worker thread. `status` is the last line pip printed."""
+
+    def __init__(self, module, install_module):
+        self.module = module
+        self.install_module = install_module
+        self.status = "Starting pip..."
+        self.done = False
+        self.ok = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        args = [self.install_module] if isinstance(self.install_module, str) else list(self.install_module)
+        cmd = [sys.executable, "-m", "pip", "install", *args, "--no-warn-script-location"] #"--user",  , '--target', site_packages_dir
         try:
-            exec("import " + module)
-        except ModuleNotFoundError:
-            self.report({"INFO"}, "Not found: " + module + " module.")
-            print("Not found: " + module + " module")            
+            proc = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding='utf-8', errors='replace'
+            )
+            for line in proc.stdout:
+                line = line.strip()
+                if line:
+                    print(line)
+                    self.status = line
+            self.ok = proc.wait() == 0
+        except Exception as e:
+            # Anything short of finishing must still end the install, or the watch timer never stops
+            self.ok = False
+            self.status = str(e)
+        finally:
+            self.done = True
+
+
+def watch_module_installs():
+    """bpy.app.timers callback: keeps the panels showing pip's progress until every install is done."""
+    tag_sequencer_redraw()
+    if any(not install.done for install in module_installs.values()):
+        return 0.5
+    for install in module_installs.values():
+        print(f"Installing {install.module} {'finished' if install.ok else 'failed'}: {install.status}")
+    return None
+
+
+def import_module(self, module, install_module, optional=False):
+    """Imports `module`, looking it up only once per session.
+
+    When it is missing, `install_module` (a requirement, or a list of pip install
+    arguments) is pip installed in a background thread
+    and False is returned; the calling operator can be run again once the
+    install is done (progress shows in the Whisper panel and the console).
+    An optional module is installed quietly, and not retried this session
+    once its install has failed.
+    """
+    module = str(module)
+    if module in resolved_modules:
+        return True
+    if module in unavailable_modules:
+        return False
+    ensure_module_paths()
+
+    install = module_installs.get(module)
+    if install is not None:
+        if not install.done:
+            self.report({"INFO"}, f"Still installing {module}: {install.status}")
+            return False
+        importlib.invalidate_caches() # Let the import system see the new package
+    try:
+        importlib.import_module(module)
+    except ModuleNotFoundError:
+        if install is not None:
+            del module_installs[module] # Allow another attempt
+            if optional:
+                unavailable_modules.add(module)
+                print(f"Optional module {module} could not be installed, continuing without it.")
+                return False
+            self.report({"ERROR"}, f"Not found: {module} module. Installing it failed, check the console.")
+            print("Not found: " + module + " module")
             return False
-    #show_system_console(True)
-    #set_system_console_topmost(False)
+        if not optional:
+            show_system_console(True)
+            set_system_console_topmost(True)
+        install = module_installs[module] = ModuleInstall(module, install_module)
+        install.thread.start()
+        if not bpy.app.timers.is_registered(watch_module_installs):
+            bpy.app.timers.register(watch_module_installs, first_interval=0.5)
+        if not optional:
+            self.report({"INFO"}, f"Installing: {module} module in the background. Run this again when it has finished.")
+        print("Installing: " + module + " module")
+        return False
+    module_installs.pop(module, None)
+    resolved_modules.add(module)
     return True
 
 
@@ -910,32 +2878,16 @@ class SEQUENCER_OT_refresh_list(bpy.types.Operator):
     def execute(self, context):
         
         active = context.scene.sequence_editor.active_strip
-        # Clear the list
-        context.scene.text_strip_items.clear()
-
-        # Get a list of all Text Strips in the VSE
-        text_strips = [
-            strip
-            for strip in bpy.context.scene.sequence_editor.sequences
-            if strip.type == "TEXT"
-        ]
-
-        # Sort the Subtitle Editor based on their start times in the timeline
-        text_strips.sort(key=lambda strip: strip.frame_start)
+        # Only the items that differ from the text strips are touched
+        sync_text_strip_items(context.scene)
 
-        # Iterate through the sorted text strips and add them to the list
-        for strip in text_strips:
-            item = context.scene.text_strip_items.add()
-            item.name = strip.name
-            item.text = strip.text
         # Select only the active strip in the UI list
-        for seq in context.scene.sequence_editor.sequences_all:
-            seq.select = False
         if active:
-            context.scene.sequence_editor.active_strip = active
-            active.select = True
-            # Set the current frame to the start frame of the active strip
-            bpy.context.scene.frame_set(int(active.frame_start))
+            select_text_strip(context, active)
+        else:
+            for seq in context.scene.sequence_editor.sequences_all:
+                if seq.select:
+                    seq.select = False
         return {"FINISHED"}
 
 
@@ -960,7 +2912,7 @@ class SEQUENCER_OT_add_strip(bpy.types.Operator):
             cf = context.scene.frame_current
             in_frame = cf + strip.frame_final_duration
             out_frame = cf + (2 * strip.frame_final_duration)
-            chan = find_first_empty_channel(in_frame, out_frame)
+            chan = ChannelIndex(text_strips).first_free(in_frame, out_frame)
 
             # Add a new text strip after the selected strip
             strips = scene.sequence_editor.sequences
@@ -992,7 +2944,7 @@ class SEQUENCER_OT_add_strip(bpy.types.Operator):
             self.report({"INFO"}, "Copying settings from the selected item")
         else:
             strips = scene.sequence_editor.sequences
-            chan = find_first_empty_channel(
+            chan = ChannelIndex(text_strips).first_free(
                 context.scene.frame_current, context.scene.frame_current + 100
             )
 
@@ -1021,6 +2973,61 @@ class SEQUENCER_OT_add_strip(bpy.types.Operator):
         return {"FINISHED"}
 
 
+def merge_frame_ranges(ranges):
+    """Sorted [start, end) frame ranges with overlapping and touching ones joined."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def ripple_delete_ranges(scene, ranges):
+    """Cuts all strips at the edges of the frame ranges, deletes what lies inside and closes the gaps.
+
+    Strips are matched to range edges by bisecting the sorted edges once per strip, so the
+    work grows with the number of strips, not with frames x strips. There is one split call
+    per edge that a strip crosses, and one delete call for all ranges.
+    """
+    editor = scene.sequence_editor
+    ranges = merge_frame_ranges(ranges)
+    if editor is None or not ranges:
+        return
+    edges = sorted({frame for frame_range in ranges for frame in frame_range})
+
+    crossing = {}
+    for strip in editor.sequences_all:
+        if strip.select:
+            strip.select = False
+        i = bisect.bisect_right(edges, strip.frame_final_start)
+        while i < len(edges) and edges[i] < strip.frame_final_end:
+            crossing.setdefault(edges[i], []).append(strip)
+            i += 1
+
+    # Highest edge first: a split keeps the left part in the original strip, which is
+    # the part that may still cross the lower edges
+    selected = []
+    for frame in sorted(crossing, reverse=True):
+        for strip in selected:
+            strip.select = False
+        selected = crossing[frame]
+        for strip in selected:
+            strip.select = True
+        bpy.ops.sequencer.split(frame=frame, type="SOFT", side="NO_CHANGE")
+
+    starts = [start for start, _end in ranges]
+    for strip in editor.sequences_all:
+        i = bisect.bisect_right(starts, strip.frame_final_start) - 1
+        inside = i >= 0 and strip.frame_final_end <= ranges[i][1]
+        if strip.select != inside:
+            strip.select = inside
+    scene.frame_current = ranges[0][0] + 1
+    bpy.ops.sequencer.delete()
+    bpy.ops.sequencer.gap_remove(all=True)
+
+
 class SEQUENCER_OT_delete_strip(bpy.types.Operator):
     """Remove item and ripple delete within its range"""
 
@@ -1046,40 +3053,7 @@ class SEQUENCER_OT_delete_strip(bpy.types.Operator):
         strip_name = items[index].name
         strip = get_strip_by_name(strip_name)
         if strip:
-            # Select all strips
-            for seq in bpy.context.scene.sequence_editor.sequences_all:
-                seq.select = True
-            # Split out
-            scene.frame_current = strip.frame_final_start + strip.frame_final_duration
-            bpy.ops.sequencer.split(frame=scene.frame_current, type="SOFT", side="LEFT")
-
-            # Select all strips
-            for seq in bpy.context.scene.sequence_editor.sequences_all:
-                seq.select = True
-            # Split in
-            frame_current = scene.frame_current = strip.frame_final_start
-            bpy.ops.sequencer.split(frame=frame_current, type="SOFT", side="RIGHT")
-
-            # Deslect all
-            for s in bpy.context.scene.sequence_editor.sequences_all:
-                s.select = False
-            # Select all between in and out
-            frame_range = range(
-                strip.frame_final_start + 1,
-                strip.frame_final_start + strip.frame_final_duration,
-            )
-            for s in frame_range:
-                # scene.frame_current = s
-                for stri in bpy.context.scene.sequence_editor.sequences_all:
-                    if (
-                        stri.frame_final_start
-                        <= s
-                        <= stri.frame_final_start + stri.frame_final_duration
-                    ):
-                        stri.select = True
-            scene.frame_current = strip.frame_final_start + 1
-            bpy.ops.sequencer.delete()
-            bpy.ops.sequencer.gap_remove(all=True)
+            ripple_delete_ranges(scene, [(strip.frame_final_start, strip.frame_final_end)])
 
             # Remove the UI list item
             items.remove(index)
@@ -1091,6 +3065,36 @@ class SEQUENCER_OT_delete_strip(bpy.types.Operator):
         return {"FINISHED"}
 
 
+class SEQUENCER_OT_delete_selected_strips(bpy.types.Operator):
+    """Ripple delete the ranges of all selected subtitles in one pass"""
+
+    bl_idname = "text.delete_selected_strips"
+    bl_label = "Ripple Delete Selected Subtitles"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.sequence_editor is not None and any(
+            strip.type == "TEXT" for strip in context.selected_sequences or ()
+        )
+
+    def execute(self, context):
+        scene = context.scene
+        frame_org = scene.frame_current
+        ranges = [
+            (strip.frame_final_start, strip.frame_final_end)
+            for strip in context.selected_sequences
+            if strip.type == "TEXT"
+        ]
+        ripple_delete_ranges(scene, ranges)
+        # Refresh the UIList
+        bpy.ops.text.refresh_list()
+
+        scene.frame_current = frame_org
+        self.report({"INFO"}, f"Ripple deleted {len(ranges)} subtitle(s)")
+        return {"FINISHED"}
+
+
 class SEQUENCER_OT_delete_item(bpy.types.Operator):
     """Remove strip and item from the list"""
 
@@ -1191,13 +3195,6 @@ class SEQUENCER_OT_insert_newline(bpy.types.Operator):
 
 
 def load_subtitles(self, file, context, offset):
-    
-    #def ensure_pip(self):
-    app_path = site.USER_SITE
-    if app_path not in sys.path:
-        sys.path.append(app_path)
-    pybin = sys.executable
-    
     print("Please wait. Checking pysubs2 module...")
 
     if not import_module(self, "pysubs2", "pysubs2"):
@@ -1210,14 +3207,8 @@ def load_subtitles(self, file, context, offset):
     fps_conv = fps / 1000
 
     editor = bpy.context.scene.sequence_editor
-    sequences = bpy.context.sequences
-    if not sequences:
-        addSceneChannel = 1
-    else:
-        channels = [s.channel for s in sequences]
-        channels = sorted(list(set(channels)))
-        empty_channel = channels[-1] + 1
-        addSceneChannel = empty_channel
+    channels = ChannelIndex(editor.sequences_all)
+    addSceneChannel = channels.top_channel() + 1
     if pathlib.Path(file).is_file():
         if (
             pathlib.Path(file).suffix
@@ -1269,21 +3260,17 @@ def load_subtitles(self, file, context, offset):
             position = True
             line.text = re.sub(r"{.+?}", "", line.text)
         if line.end and line.text and line.start:
-            new_strip = editor.sequences.new_effect(
-                name=line.text,
-                type="TEXT",
-                channel=addSceneChannel,
-                frame_start=int(line.start * fps_conv) + offset,
-                frame_end=int(line.end * fps_conv) + offset,
+            frame_start = int(line.start * fps_conv) + offset
+            frame_end = int(line.end * fps_conv) + offset
+            # Overlapping lines stack above the import channel instead of being shuffled by Blender
+            new_strip = add_imported_subtitle_strip(
+                editor,
+                line.text,
+                channels.first_free(frame_start, frame_end, addSceneChannel),
+                frame_start,
+                frame_end,
             )
-            new_strip.text = line.text
-            new_strip.wrap_width = 0.68
-            new_strip.font_size = 44
-            new_strip.location[1] = 0.25
-            new_strip.anchor_x = "CENTER"
-            new_strip.anchor_y = "TOP"
-            new_strip.use_shadow = True
-            new_strip.use_box = True
+            channels.add_strip(new_strip)
             if position:
                 new_strip.location[0] = x
                 new_strip.location[1] = y
@@ -1296,6 +3283,26 @@ def load_subtitles(self, file, context, offset):
     bpy.ops.text.refresh_list()
 
 
+def add_imported_subtitle_strip(editor, text, channel, frame_start, frame_end):
+    """Creates a text strip in the style of imported subtitles."""
+    new_strip = editor.sequences.new_effect(
+        name=text,
+        type="TEXT",
+        channel=channel,
+        frame_start=frame_start,
+        frame_end=frame_end,
+    )
+    new_strip.text = text
+    new_strip.wrap_width = 0.68
+    new_strip.font_size = 44
+    new_strip.location[1] = 0.25
+    new_strip.anchor_x = "CENTER"
+    new_strip.anchor_y = "TOP"
+    new_strip.use_shadow = True
+    new_strip.use_box = True
+    return new_strip
+
+
 def check_overlap(strip1, start, end):
     # Check if the strips overlap.
     # print(str(strip1.frame_final_start + strip1.frame_final_duration)+">="+str(start)+" "+str(strip1.frame_final_start) +" <= "+str(end))
@@ -1326,10 +3333,73 @@ class subtitle_preferences(bpy.types.AddonPreferences):
         items=load_models,
         default="LARGE",
     )
+
+    model_cache_budget: bpy.props.IntProperty(
+        name="Model Cache Budget (MB)",
+        description="RAM the loaded Faster Whisper models may use before the least recently used ones are unloaded",
+        default=4096,
+        min=0,
+    )
     
+    decode_cache_size: bpy.props.IntProperty(
+        name="Decoded Audio Cache (MB)",
+        description="Disk space for audio decoded to 16 kHz, reused by later transcriptions of the same file. 0 disables the cache",
+        default=2048,
+        min=0,
+    )
+
+    model_dir: bpy.props.StringProperty(
+        name="Model Folder",
+        description="Folder with local copies of the Faster Whisper models, one sub-folder per model size. Empty uses the add-on's data folder",
+        subtype='DIR_PATH',
+        default="",
+    )
+
+    offline_mode: bpy.props.BoolProperty(
+        name="Offline",
+        description="Only load models from the model folder and never contact the Hugging Face hub",
+        default=False,
+    )
+
+    use_worker_server: bpy.props.BoolProperty(
+        name="Shared Worker Server",
+        description="Run background transcriptions in a local server process that keeps models loaded for every Blender instance on this machine, and keeps Blender running if inference crashes",
+        default=False,
+    )
+
+    worker_server_idle_minutes: bpy.props.IntProperty(
+        name="Idle Minutes",
+        description="Minutes without work before the shared worker server exits and frees its models",
+        default=10,
+        min=1,
+    )
+
+    auto_sync_list: bpy.props.BoolProperty(
+        name="Auto Sync Subtitle List",
+        description="Update the subtitle list whenever strips are added to or removed from the timeline. Moved strips still need Refresh List",
+        default=False,
+    )
+
     def draw(self, context):
         layout = self.layout
         layout.prop(self, "load_model")
+        layout.prop(self, "model_cache_budget")
+        layout.prop(self, "decode_cache_size")
+        row = layout.row()
+        row.prop(self, "model_dir")
+        row.prop(self, "offline_mode")
+        row = layout.row()
+        row.operator("sequencer.whisper_prefetch_model", icon='IMPORT')
+        row.operator("sequencer.whisper_verify_models", icon='CHECKMARK')
+        if model_store_task is not None:
+            layout.label(text=model_store_task.status, icon='INFO')
+        row = layout.row()
+        row.prop(self, "use_worker_server")
+        sub = row.row()
+        sub.active = self.use_worker_server
+        sub.prop(self, "worker_server_idle_minutes")
+        sub.operator("sequencer.whisper_stop_server", text="", icon='QUIT')
+        layout.prop(self, "auto_sync_list")
 
 
 #def format_srt_time(seconds):
@@ -1356,7 +3426,7 @@ class TEXT_OT_transcribe(bpy.types.Operator):
     bl_idname = "text.transcribe"
     bl_label = "Transcription"
     bl_description = "Transcribe audiofile to text strips"
-    bl_options = {"REGISTER", "UNDO"}
+    bl_options = {"UNDO"} # No redo panel, options are asked for in invoke
 
     @classmethod
     def poll(cls, context):
@@ -1365,102 +3435,38 @@ class TEXT_OT_transcribe(bpy.types.Operator):
     # Supported languages
     # ['Auto detection', 'Afrikaans', 'Albanian', 'Amharic', 'Arabic', 'Armenian', 'Assamese', 'Azerbaijani', 'Bashkir', 'Basque', 'Belarusian', 'Bengali', 'Bosnian', 'Breton', 'Bulgarian', 'Burmese', 'Castilian', 'Catalan', 'Chinese', 'Croatian', 'Czech', 'Danish', 'Dutch', 'English', 'Estonian', 'Faroese', 'Finnish', 'Flemish', 'French', 'Galician', 'Georgian', 'German', 'Greek', 'Gujarati', 'Haitian', 'Haitian Creole', 'Hausa', 'Hawaiian', 'Hebrew', 'Hindi', 'Hungarian', 'Icelandic', 'Indonesian', 'Italian', 'Japanese', 'Javanese', 'Kannada', 'Kazakh', 'Khmer', 'Korean', 'Lao', 'Latin', 'Latvian', 'Letzeburgesch', 'Lingala', 'Lithuanian', 'Luxembourgish', 'Macedonian', 'Malagasy', 'Malay', 'Malayalam', 'Maltese', 'Maori', 'Marathi', 'Moldavian', 'Moldovan', 'Mongolian', 'Myanmar', 'Nepali', 'Norwegian', 'Nynorsk', 'Occitan', 'Panjabi', 'Pashto', 'Persian', 'Polish', 'Portuguese', 'Punjabi', 'Pushto', 'Romanian', 'Russian', 'Sanskrit', 'Serbian', 'Shona', 'Sindhi', 'Sinhala', 'Sinhalese', 'Slovak', 'Slovenian', 'Somali', 'Spanish', 'Sundanese', 'Swahili', 'Swedish', 'Tagalog', 'Tajik', 'Tamil', 'Tatar', 'Telugu', 'Thai', 'Tibetan', 'Turkish', 'Turkmen', 'Ukrainian', 'Urdu', 'Uzbek', 'Valencian', 'Vietnamese', 'Welsh', 'Yiddish', 'Yoruba']
 
+    write_srt: BoolProperty(
+        name="Save SRT File",
+        description="Also save the transcription as an .srt file next to the audio file",
+        default=False,
+    )
+
+    def invoke(self, context, event):
+        # Ask up front: changing it in the redo panel would run the whole transcription again
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        self.layout.prop(self, "write_srt")
+
     def execute(self, context):
-        
-#        #def ensure_pip(self):
-#        app_path = site.USER_SITE
-#        if app_path not in sys.path:
-#            sys.path.append(app_path)
-        pybin = sys.executable
-        print("pybin: "+str(pybin))
-
-        # Get the path of the Python executable (e.g., python.exe)
-        python_exe_dir = os.path.dirname(os.__file__)
-        # Construct the path to the site-packages directory
-        site_packages_dir = os.path.join(python_exe_dir, 'lib', 'site-packages') if os.name == 'nt' else os.path.join(python_exe_dir, 'lib', 'python3.x', 'site-packages')        
-
-        # Add the site-packages directory to the top of sys.path
-        sys.path.insert(0, site_packages_dir)
-        print("site_packages_dir: "+str(site_packages_dir))
-
-#        print("Ensuring: pip")
-#        try:
-#            subprocess.call([pybin, "-m", "ensurepip"])
-#            #subprocess.call([pybin, "-m", "pip", "install", "--upgrade","pip"])
-#        except ImportError:
-#            print("Pip installation failed!")
-#            #return False
-#        #return True        
-        
-        
+        # Installs only happen when a module is missing, in the background (see import_module)
         print("Please wait. Checking torch & whisper modules...")
-        #import_module(self, "torch", "torch==2.0.0")
-
         if os_platform == "Windows":
-            subprocess.call(
-                [
-                    pybin,
-                    "-m",
-                    "pip",
-                    "install",
-                    "torch",
-                    "--index-url",
-                    "https://download.pytorch.org/whl/cu124",
-                    "--no-warn-script-location",
-                    #'--target', site_packages_dir,
-                ]
-            )
+            torch_install = ["torch", "--index-url", "https://download.pytorch.org/whl/cu124"]
         else:
-             subprocess.call(
-                [
-                    pybin,
-                    "-m",
-                    "pip",
-                    "install",
-                    "torch",
-                    "--no-warn-script-location",
-                    #'--target', site_packages_dir,
-                ]
-            )  
-                 
+            torch_install = "torch"
+        if not import_module(self, "torch", torch_install):
+            return {"CANCELLED"}
+        if not import_module(self, "whisper", "openai-whisper"): # "openai_whisper"):#
+            return {"CANCELLED"}
+        #import_module(self, "whisper", "git+https://github.com/openai/whisper.git") # "openai_whisper"):#
+        # Optional speed-up for word timings on CUDA; whisper falls back without it, so don't wait for it
         if os_platform == "Windows":
-            try:
-                exec("import triton")
-            except ModuleNotFoundError:
-                subprocess.call(
-                    [
-                        pybin,
-                        "-m",
-                        "pip",
-                        "install",
-                        "--disable-pip-version-check",
-                        "--use-deprecated=legacy-resolver",
-                        "triton-windows",
-                        #"https://github.com/woct0rdho/triton-windows/releases/download/v3.2.0-windows.post9/triton-3.2.0-cp311-cp311-win_amd64.whl",
-                        #"https://hf-mirror.com/LightningJay/triton-2.1.0-python3.11-win_amd64-wheel/resolve/main/triton-2.1.0-cp311-cp311-win_amd64.whl",
-                        "--no-warn-script-location",
-                        "--upgrade",
-                        #'--target', site_packages_dir,
-                    ]
-                )                        
+            import_module(self, "triton", ["--disable-pip-version-check", "--use-deprecated=legacy-resolver", "--upgrade", "triton-windows"], optional=True)
         else:
-            try:
-                exec("import triton")
-            except ModuleNotFoundError:
-                import_module(self, "triton", "triton")
-
-        import_module(self, "whisper", "openai-whisper") # "openai_whisper"):#
-        #import_module(self, "whisper", "git+https://github.com/openai/whisper.git") # "openai_whisper"):#
-
-        print("Checking srttranslator module...")
-        if not import_module(self, "srtranslator", "srtranslator"):
-            print("Srttranslator module not found!")
-            return {"CANCELLED"}
-
-        from srtranslator import SrtFile
+            import_module(self, "triton", "triton", optional=True)
 
         import whisper
-        from whisper.utils import get_writer
         current_scene = bpy.context.scene
         try:
             active = current_scene.sequence_editor.active_strip
@@ -1473,66 +3479,70 @@ class TEXT_OT_transcribe(bpy.types.Operator):
         if not active.type == "SOUND":
             self.report({"INFO"}, "Active strip is not a sound strip!")
             return {"CANCELLED"}
-        offset = int(active.frame_start)
-        clip_start = int(active.frame_start + active.frame_offset_start)
-        clip_end = int(
-            active.frame_start + active.frame_final_duration
-        ) 
+        render = current_scene.render
+        fps = render.fps / render.fps_base
+        fps_conv = fps / 1000
+        # Only the trimmed, visible part of the strip is transcribed
+        clip, offset = get_strip_audio_window(active, fps)
+        offset = int(offset)
         sound_path = bpy.path.abspath(active.sound.filepath)
         sound_path = os.path.normpath(os.path.realpath(sound_path))  # Fully resolve path
-        output_dir = os.path.dirname(sound_path)
         print("sound_path: "+str(sound_path))
-        print("output_dir: "+str(output_dir))
-        audio_basename = os.path.basename(sound_path)
-        print("audio_basename: "+str(audio_basename))
 
         print("Please wait. Processing file...")
         load_model = context.preferences.addons[__name__].preferences.load_model
-        model = whisper.load_model(load_model.lower())
-
-        out_dir = os.path.join(output_dir, audio_basename + ".srt")
-        if os.path.exists(out_dir):
-            os.remove(out_dir)
-
-        transcribe = model.transcribe(sound_path, word_timestamps=True)
+        model = get_openai_whisper_model(load_model.lower())
+
+        audio = sound_path
+        if clip:
+            samples = whisper.load_audio(sound_path) # 16 kHz mono float32
+            start, end = clip
+            audio = samples[int(start * whisper.audio.SAMPLE_RATE):int(end * whisper.audio.SAMPLE_RATE)]
+        transcribe = model.transcribe(audio, word_timestamps=True)
         segments = transcribe["segments"]
 
         silence_threshold = 1000  # 1 second of silence before breaking subtitles
 
-        with open(out_dir, "w", encoding="utf-8") as srtFile:
-            segmentId = 0
-            last_end_time = 0
-
-            for segment in segments:
-                words = segment.get("words", [])
-                if not words:
-                    continue  # Skip empty segments
-
-                start_time = words[0]["start"] * 1000  # Convert to ms
-                end_time = words[-1]["end"] * 1000  # Convert to ms
-
-                # If there's a big silence gap before this segment, adjust timing
-                if start_time - last_end_time > silence_threshold:
-                    start_time = last_end_time  # Fix start time
-
-                last_end_time = end_time  # Update end time
-
-                startTime = format_srt_time(start_time)
-                endTime = format_srt_time(end_time)
-
-                text = segment["text"].strip()
-                if not text:
-                    continue  # Skip empty text
-                text = add_punctuation(text)
-
-                srt_segment = f"{segmentId + 1}\n{startTime} --> {endTime}\n{text}\n\n"
-                srtFile.write(srt_segment)
-
-                segmentId += 1
+        # (start ms, end ms, text) per subtitle
+        lines = []
+        last_end_time = 0
+        for segment in segments:
+            words = segment.get("words", [])
+            if not words:
+                continue  # Skip empty segments
+
+            start_time = words[0]["start"] * 1000  # Convert to ms
+            end_time = words[-1]["end"] * 1000  # Convert to ms
+
+            # If there's a big silence gap before this segment, adjust timing
+            if start_time - last_end_time > silence_threshold:
+                start_time = last_end_time  # Fix start time
+
+            last_end_time = end_time  # Update end time
+
+            text = segment["text"].strip()
+            if not text:
+                continue  # Skip empty text
+            lines.append((start_time, end_time, add_punctuation(text)))
+
+        if self.write_srt:
+            out_dir = os.path.join(os.path.dirname(sound_path), os.path.basename(sound_path) + ".srt")
+            with open(out_dir, "w", encoding="utf-8") as srtFile:
+                for segmentId, (start_time, end_time, text) in enumerate(lines):
+                    srtFile.write(f"{segmentId + 1}\n{format_srt_time(start_time)} --> {format_srt_time(end_time)}\n{text}\n\n")
+            print("Saved: " + out_dir)
+
+        # Straight to strips, on a channel above everything like imported subtitles
+        editor = current_scene.sequence_editor
+        channel = max((s.channel for s in editor.sequences_all), default=0) + 1
+        for start_time, end_time, text in lines:
+            frame_start = int(start_time * fps_conv) + offset
+            frame_end = max(int(end_time * fps_conv) + offset, frame_start + 1)
+            add_imported_subtitle_strip(editor, text, channel, frame_start, frame_end)
+        bpy.ops.text.refresh_list()
 
         print("Processing finished.")
-        if os.path.exists(out_dir):
-            load_subtitles(self, out_dir, context, offset)
+        self.report({"INFO"}, f"Transcribed {len(lines)} subtitle(s).")
         return {"FINISHED"}
 
 
@@ -1770,40 +3780,20 @@ class SEQUENCER_OT_export_list_subtitles(Operator, ImportHelper):
         # Sort the Subtitle Editor based on their start times in the timeline
         text_strips.sort(key=lambda strip: strip.frame_start)
 
-        from pysubs2 import SSAFile, SSAEvent, make_time
-
         file_name = self.filepath
         if pathlib.Path(file_name).suffix != "." + self.formats:
             file_name = self.filepath + "." + self.formats
-        if self.formats != "fountain":
-            subs = SSAFile()
-            # Iterate through the sorted text strips and add them to the list
-            for strip in text_strips:
-                event = SSAEvent()
-                event.start = frame_to_ms(strip.frame_final_start)
-                event.end = frame_to_ms(
-                    strip.frame_final_start + strip.frame_final_duration
-                )
-                event.text = strip.text
-                event.bold = strip.use_bold
-                event.italic = strip.use_italic
-
-                subs.append(event)
-            text = subs.to_string(self.formats)
-            #            if self.formats == "microdvd": #doesn't work
-            #                subs.save(file_name, format_="microdvd", fps=(scene.render.fps / scene.render.fps_base))
-            if self.formats == "mpl2":
-                subs.save(file_name, format_="mpl2")
-            else:
-                subs.save(file_name)
-        else:
-            text = ""
-            # Iterate through the sorted text strips and add them to the list
-            for strip in text_strips:
-                text = text + strip.text + chr(10) + chr(13) + " " + chr(10) + chr(13)
-            fountain_file = open(file_name, "w")
-            fountain_file.write(text)
-            fountain_file.close()
+        events = [
+            (
+                frame_to_ms(strip.frame_final_start),
+                frame_to_ms(strip.frame_final_start + strip.frame_final_duration),
+                strip.text,
+                strip.use_bold,
+                strip.use_italic,
+            )
+            for strip in text_strips
+        ]
+        whisper_worker.save_subtitles(events, file_name, self.formats)
         return {"FINISHED"}
 
     def draw(self, context):
@@ -1903,6 +3893,7 @@ class SEQUENCER_PT_panel(bpy.types.Panel):
         row.operator("text.add_strip", text="", icon="ADD", emboss=True)
         row.operator("text.delete_item", text="", icon="REMOVE", emboss=True)
         row.operator("text.delete_strip", text="", icon="SCULPTMODE_HLT", emboss=True)
+        row.operator("text.delete_selected_strips", text="", icon="TRASH", emboss=True)
 
         row.separator()
 
@@ -1940,14 +3931,21 @@ class SEQUENCER_PT_whisper_panel(bpy.types.Panel):
         row = box.row(align=True)
         # Display status icon based on check
         status_icon = 'CHECKMARK' if dependencies_installed else 'ERROR'
-        if not dependencies_checked and not dependencies_installed:
-             status_icon = 'QUESTION' # Indicate unchecked state
+        if dependencies_installed and not dependencies_checked:
+             status_icon = 'QUESTION' # Found, but not imported yet
 
         row.label(text="Dependencies:", icon=status_icon)
-        row.operator(SEQUENCER_OT_whisper_setup.bl_idname, icon='SCRIPTPLUGINS')
+        if faster_whisper_outdated():
+            row.operator(SEQUENCER_OT_whisper_setup.bl_idname, text="Upgrade", icon='SCRIPTPLUGINS')
+            box.label(text=f"faster-whisper {faster_whisper_version} is outdated, {FASTER_WHISPER_VERSION} is needed", icon='ERROR')
+        else:
+            row.operator(SEQUENCER_OT_whisper_setup.bl_idname, icon='SCRIPTPLUGINS')
+        for install in module_installs.values():
+            if not install.done:
+                box.label(text=f"Installing {install.module}: {install.status}", icon='IMPORT')
 
         # Disable transcription controls if dependencies not met
-        is_ready = dependencies_installed and faster_whisper_module is not None
+        is_ready = dependencies_installed
         col = layout.column()
         col.enabled = is_ready # Disable subsequent sections if not ready
 
@@ -1955,14 +3953,55 @@ class SEQUENCER_PT_whisper_panel(bpy.types.Panel):
         box = col.box()
         # ... (existing model, device, compute, language, beam, vad props) ...
         box.prop(props, "model_size", text="Model")
+        tuned = get_tuned_settings(props.model_size, props.device)
+        if tuned:
+            box.label(text=f"Tuned: {tuned['compute_type']}, {tuned['cpu_threads'] or 'default'} threads, RTF {tuned['rtf']:.2f}", icon='SETTINGS')
         row = box.row(align=True)
         row.prop(props, "device", text="Device")
         row.prop(props, "compute_type", text="Compute")
         box.prop(props, "language", text="Language")
+        if props.language == "auto":
+            box.prop(props, "language_model")
         row = box.row(align=True)
         row.prop(props, "beam_size", text="Beam Size")
         row.prop(props, "use_vad", text="VAD Filter")
+        row = box.row(align=True)
+        row.active = props.transcription_mode != 'BATCHED'
+        row.prop(props, "use_adaptive_beam")
+        if props.use_adaptive_beam:
+            row = box.row(align=True)
+            row.active = props.transcription_mode != 'BATCHED'
+            row.prop(props, "adaptive_logprob_threshold", text="Log Prob")
+            row.prop(props, "adaptive_no_speech_threshold", text="No Speech")
+            row.prop(props, "adaptive_compression_threshold", text="Compression")
+        row = box.row(align=True)
+        row.prop(props, "transcription_mode", text="")
+        sub = row.row(align=True)
+        sub.active = props.transcription_mode == 'BATCHED'
+        sub.prop(props, "batch_size", text="Batch")
+        row = box.row(align=True)
+        row.prop(props, "cpu_threads", text="Threads")
+        row.prop(props, "num_workers", text="Workers")
+        if autotune_task is not None:
+            row = box.row(align=True)
+            row.label(text=autotune_task.status, icon='TIME')
+            row.operator(SEQUENCER_OT_whisper_autotune_cancel.bl_idname, text="", icon='CANCEL')
+        else:
+            box.operator(SEQUENCER_OT_whisper_autotune.bl_idname, icon='PREFERENCES')
+        row = box.row(align=True)
+        row.prop(props, "use_word_timestamps")
+        row.operator(SEQUENCER_OT_whisper_resplit.bl_idname, text="", icon='TEXT')
+        row = box.row(align=True)
+        row.prop(props, "use_checkpoints")
+        row.prop(props, "use_result_cache")
+        row.operator(SEQUENCER_OT_whisper_clear_cache.bl_idname, text="", icon='TRASH')
 
+        # --- Model Cache ---
+        box = col.box()
+        row = box.row(align=True)
+        row.label(text=f"Cached Models: {len(whisper_model_cache)} (~{model_cache_usage_mb()} / {get_model_cache_budget_mb()} MB)", icon='MEMORY')
+        row.operator(SEQUENCER_OT_whisper_unload_models.bl_idname, text="", icon='TRASH')
+        box.label(text=f"Hits: {model_cache_stats['hits']}  Misses: {model_cache_stats['misses']}  Evictions: {model_cache_stats['evictions']}")
 
         # --- NEW: Subtitle Output Settings ---
         box = col.box()
@@ -1978,6 +4017,14 @@ class SEQUENCER_PT_whisper_panel(bpy.types.Panel):
         box = col.box()
         action_col = box.column(align=True)
 
+        if transcription_job is not None:
+            row = box.row(align=True)
+            row.progress(factor=transcription_job.progress, type='BAR', text=transcription_job.status)
+            row.operator(SEQUENCER_OT_whisper_cancel.bl_idname, text="", icon='CANCEL')
+        elif transcription_status_message:
+            box.label(text=transcription_status_message, icon='INFO')
+        box.prop(props, "run_in_background")
+
         strip_selected = get_selected_strip(context) is not None and SEQUENCER_OT_whisper_transcribe.poll(context)
         action_col.enabled = strip_selected
 
@@ -1988,6 +4035,27 @@ class SEQUENCER_PT_whisper_panel(bpy.types.Panel):
         op_translate = action_col.operator(SEQUENCER_OT_whisper_transcribe.bl_idname, text="Translate to Text Strips (EN)", icon='WORDWRAP_ON')
         op_translate.task = "translate"
 
+        selected = get_selected_sound_strips(context)
+        if selected and transcription_job is None:
+            fps = scene.render.fps / scene.render.fps_base
+            workers = props.batch_workers if props.device == 'cpu' else 1
+            estimate = get_panel_estimate(props, selected, fps, workers if props.use_parallel_chunks else 1)
+            over = estimate["available_mb"] is not None and estimate["memory_mb"] > estimate["available_mb"]
+            col_estimate = box.column(align=True)
+            col_estimate.alert = over
+            col_estimate.label(text=f"Estimate: ~{format_duration(estimate['seconds'])} (RTF {estimate['rtf']:.2f}, {estimate['rtf_source']})", icon='TIME')
+            free = f" of {estimate['available_mb']} MB free" if estimate["available_mb"] is not None else ""
+            col_estimate.label(text=f"Memory: ~{estimate['memory_mb']} MB{free}", icon='ERROR' if over else 'MEMORY')
+
+        # --- Batch Section ---
+        box = col.box()
+        batch_col = box.column(align=True)
+        row = batch_col.row(align=True)
+        row.prop(props, "batch_workers")
+        row.prop(props, "use_parallel_chunks", text="", icon='MOD_EXPLODE')
+        row.active = props.device == 'cpu'
+        batch_col.operator(SEQUENCER_OT_whisper_transcribe_batch.bl_idname, text="Batch Transcribe Selected", icon='SEQ_STRIP_DUPLICATE')
+
 
 def import_subtitles(self, context):
     layout = self.layout
@@ -2010,6 +4078,10 @@ def copyto_panel_append(self, context):
 
 
 def setText(self, context):
+    global focused_text_item
+    if syncing_text_strip_items:
+        return
+    focused_text_item = None # A new list index always moves the focus
     scene = context.scene
     current_index = context.scene.text_strip_items_index
     max_index = len(context.scene.text_strip_items)
@@ -2029,6 +4101,7 @@ classes = (
     SEQUENCER_OT_add_strip,
     SEQUENCER_OT_delete_item,
     SEQUENCER_OT_delete_strip,
+    SEQUENCER_OT_delete_selected_strips,
     SEQUENCER_OT_select_next,
     SEQUENCER_OT_select_previous,
     SEQUENCER_OT_insert_newline,
@@ -2041,6 +4114,16 @@ classes = (
     WhisperProperties,
     SEQUENCER_OT_whisper_setup,
     SEQUENCER_OT_whisper_transcribe,
+    SEQUENCER_OT_whisper_transcribe_batch,
+    SEQUENCER_OT_whisper_resplit,
+    SEQUENCER_OT_whisper_cancel,
+    SEQUENCER_OT_whisper_unload_models,
+    SEQUENCER_OT_whisper_stop_server,
+    SEQUENCER_OT_whisper_prefetch_model,
+    SEQUENCER_OT_whisper_autotune,
+    SEQUENCER_OT_whisper_autotune_cancel,
+    SEQUENCER_OT_whisper_verify_models,
+    SEQUENCER_OT_whisper_clear_cache,
     SEQUENCER_PT_whisper_panel,
 )
 
@@ -2058,14 +4141,13 @@ def register():
     bpy.types.Scene.whisper_props = PointerProperty(type=WhisperProperties)
 
     # Reset global flags on registration / Blender start
-    global dependencies_checked, dependencies_installed, faster_whisper_module
+    global dependencies_checked, dependencies_installed, faster_whisper_module, faster_whisper_stamp_path
     dependencies_checked = False
     dependencies_installed = False
     faster_whisper_module = None
-    # Perform an initial check silently on registration/startup
-    print("Performing initial dependency check on startup...")
-    check_faster_whisper()
-    dependencies_checked = True # Mark as checked
+    # Only look faster-whisper up here; importing it costs seconds and is left to its first use
+    faster_whisper_stamp_path = os.path.join(get_addon_cache_dir("dependencies"), "faster_whisper.json")
+    find_faster_whisper()
     
     bpy.types.Scene.text_strip_items = bpy.props.CollectionProperty(type=TextStripItem)
     bpy.types.Scene.text_strip_items_index = bpy.props.IntProperty(
@@ -2074,6 +4156,9 @@ def register():
     bpy.types.SEQUENCER_MT_add.append(import_subtitles)
     #bpy.types.SEQUENCER_MT_add.append(transcribe)
     bpy.types.SEQUENCER_PT_effect.append(copyto_panel_append)
+    for handlers, handler in APP_HANDLERS:
+        if handler not in handlers:
+            handlers.append(handler)
 
 
 def unregister():
@@ -2092,6 +4177,16 @@ def unregister():
 
     # Clear globals on unregister (optional, good practice)
     global dependencies_checked, dependencies_installed, faster_whisper_module
+    cancel_transcription_job()
+    if autotune_task is not None:
+        autotune_task.cancel_event.set()
+    unload_whisper_models()
+    for timer in (watch_module_installs, watch_model_store_task, watch_autotune_task, run_auto_sync):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+    for handlers, handler in APP_HANDLERS:
+        if handler in handlers:
+            handlers.remove(handler)
     dependencies_checked = False
     dependencies_installed = False
     faster_whisper_module = None
@@ -0,0 +1,331 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Headless batch transcription for the Subtitle Editor add-on.
+
+Transcribes a directory or manifest of audio/video files with one warm Faster
+Whisper model and writes subtitle sidecars next to them (clip.mp4 -> clip.mp4.srt),
+or to --output-dir, which mirrors the sub-folders of scanned directories.
+No UI or scene is created, so it runs on render farms:
+
+    blender -b --python headless.py -- <dir|file|manifest>... [--formats srt,vtt,ass] [--model small] ...
+
+It only needs Blender's Python with faster-whisper and pysubs2 installed, so
+`python headless.py ...` works as well. A manifest is a .txt file with one path
+per line (# starts a comment) or a .json list of paths.
+
+A JSON summary goes to stdout (or --summary FILE). Exit codes:
+    0  every file transcribed
+    1  some files failed
+    2  bad arguments or no input files
+    3  missing module or the model could not be loaded
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import whisper_worker
+
+EXIT_OK = 0
+EXIT_FAILED_FILES = 1
+EXIT_USAGE = 2
+EXIT_SETUP = 3
+
+MEDIA_EXTENSIONS = {
+    '.wav', '.mp3', '.ogg', '.flac', '.m4a', '.aac', '.wma', '.opus',
+    '.mp4', '.mov', '.mkv', '.avi', '.webm', '.mxf',
+}
+MANIFEST_EXTENSIONS = {'.txt', '.json'}
+
+
+def script_args(argv):
+    """Blender passes its own arguments too; ours are the ones after `--`."""
+    if "--" in argv:
+        return argv[argv.index("--") + 1:]
+    return argv[1:]
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog="blender -b --python headless.py --",
+        description="Transcribe audio/video files to subtitle sidecars with Faster Whisper.",
+    )
+    parser.add_argument("inputs", nargs="+", help="Media files, directories or manifests (.txt/.json)")
+    parser.add_argument("--formats", default="srt", help="Comma separated: " + ", ".join(whisper_worker.SUBTITLE_FORMATS))
+    parser.add_argument("--output-dir", help="Write sidecars here instead of next to each file, mirroring scanned sub-folders")
+    parser.add_argument("--recursive", action="store_true", help="Also scan sub-directories")
+    parser.add_argument("--overwrite", action="store_true", help="Replace existing sidecars instead of skipping the file")
+    parser.add_argument("--model", default="small", help="Faster Whisper model size")
+    parser.add_argument("--device", default="auto", choices=("auto", "cpu", "cuda"))
+    parser.add_argument("--compute-type", default="default")
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    parser.add_argument("--model-dir", help="Local model folder (one sub-folder per model size), used when it has the model")
+    parser.add_argument("--offline", action="store_true", help="Only load the model from --model-dir, never from the hub")
+    parser.add_argument("--language", default=None, help="Language code, detected per file when omitted")
+    parser.add_argument("--detect-language-model", default="base", help="Small model detecting the language when --language is omitted, or 'none'")
+    parser.add_argument("--task", default="transcribe", choices=("transcribe", "translate"))
+    parser.add_argument("--beam-size", type=int, default=5)
+    parser.add_argument("--adaptive", action="store_true", help="Decode greedily and use the beam only on uncertain segments")
+    parser.add_argument("--no-vad", action="store_true", help="Disable the VAD filter")
+    parser.add_argument("--batch-size", type=int, default=0, help="Use batched inference with this batch size")
+    parser.add_argument("--cache-dir", help="Result cache directory, reused across runs")
+    parser.add_argument("--summary", help="Write the JSON summary here instead of stdout")
+    options = parser.parse_args(args)
+
+    options.formats = [f.strip().lower() for f in options.formats.split(",") if f.strip()]
+    unknown = [f for f in options.formats if f not in whisper_worker.SUBTITLE_FORMATS]
+    if unknown or not options.formats:
+        parser.error(f"unknown subtitle format(s): {', '.join(unknown) or '(none)'}")
+    return options
+
+
+def read_manifest(path):
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            entries = json.load(f)
+        else:
+            entries = [line.strip() for line in f]
+    return [
+        os.path.join(base, entry) # Relative entries are relative to the manifest
+        for entry in entries
+        if entry and not entry.startswith("#")
+    ]
+
+
+def collect_media_files(inputs, recursive=False):
+    """Returns (media files, missing inputs), in input order without duplicates.
+
+    Media files are (path, sub-folder) pairs, the sub-folder being relative to the
+    scanned directory so --output-dir can mirror it ("" for files and manifests).
+    """
+    files = []
+    missing = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                subdir = os.path.relpath(root, path)
+                files.extend(
+                    (os.path.join(root, name), "" if subdir == os.curdir else subdir)
+                    for name in sorted(names)
+                    if os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS
+                )
+                if not recursive:
+                    break
+        elif os.path.isfile(path) and os.path.splitext(path)[1].lower() in MANIFEST_EXTENSIONS:
+            for entry in read_manifest(path):
+                if os.path.isfile(entry):
+                    files.append((entry, ""))
+                else:
+                    missing.append(entry)
+        elif os.path.isfile(path):
+            files.append((path, ""))
+        else:
+            missing.append(path)
+
+    seen = set()
+    unique = []
+    for path, subdir in files:
+        key = os.path.realpath(path)
+        if key not in seen:
+            seen.add(key)
+            unique.append((path, subdir))
+    return unique, missing
+
+
+def sidecar_paths(media, formats, output_dir=None, subdir=""):
+    """clip.wav -> clip.wav.srt, keeping the extension so clip.wav and clip.mp4 don't share sidecars."""
+    name = os.path.basename(media)
+    directory = os.path.join(output_dir, subdir) if output_dir else os.path.dirname(os.path.abspath(media))
+    return [os.path.join(directory, f"{name}.{fmt}") for fmt in formats]
+
+
+def find_output_collisions(files, formats, output_dir=None):
+    """Maps each media file whose sidecars an earlier file in `files` also writes to that earlier file.
+
+    Inputs from different folders can still meet in one --output-dir (manifests,
+    several directories), and they would overwrite each other's subtitles.
+    """
+    owners = {}
+    collisions = {}
+    for media, subdir in files:
+        for path in sidecar_paths(media, formats, output_dir, subdir):
+            key = os.path.normcase(os.path.abspath(path))
+            owner = owners.setdefault(key, media)
+            if owner != media:
+                collisions.setdefault(media, owner)
+    return collisions
+
+
+def get_transcribe_kwargs(options):
+    # Mirrors the add-on's get_transcribe_kwargs for the scene properties
+    kwargs = dict(
+        language=options.language,
+        task=options.task,
+        beam_size=options.beam_size,
+        vad_filter=not options.no_vad,
+        vad_parameters=dict(min_silence_duration_ms=500),
+    )
+    if options.adaptive and options.beam_size > 1:
+        kwargs["adaptive"] = dict(whisper_worker.ADAPTIVE_THRESHOLDS)
+    if options.batch_size > 0:
+        kwargs["batch_size"] = options.batch_size
+        kwargs["vad_filter"] = True
+    return kwargs
+
+
+def get_language_detection(options):
+    if options.language or options.detect_language_model == "none":
+        return None
+    model_store = (options.model_dir, options.offline) if options.model_dir else None
+    if not whisper_worker.detector_available(options.detect_language_model, model_store):
+        print(f"Language detection model '{options.detect_language_model}' is not in --model-dir, the transcription model detects the language instead.", file=sys.stderr)
+        return None
+    cache_dir = os.path.join(options.cache_dir, "languages") if options.cache_dir else None
+    return {"model": options.detect_language_model, "cache_dir": cache_dir}
+
+
+def transcribe_media(get_model, media, outputs, options, transcribe_kwargs, language_detection=None):
+    """Transcribes one file and writes its sidecars to `outputs`. Returns its summary entry."""
+    started = time.monotonic()
+    segments, info = whisper_worker.transcribe(
+        get_model, media, None, [options.model, options.compute_type], transcribe_kwargs, options.cache_dir,
+        language_detection=language_detection,
+    )
+    events = []
+    for segment in segments:
+        text = segment.text.strip()
+        if text:
+            events.append((int(segment.start * 1000), int(segment.end * 1000), text, False, False))
+
+    os.makedirs(os.path.dirname(outputs[0]), exist_ok=True) # Mirrored sub-folder of --output-dir
+    for path, fmt in zip(outputs, options.formats):
+        whisper_worker.save_subtitles(events, path, fmt)
+    return {
+        "file": media,
+        "status": "ok",
+        "language": info.language,
+        "duration": info.duration,
+        "segments": len(events),
+        "outputs": outputs,
+        "elapsed": round(time.monotonic() - started, 3),
+    }
+
+
+def run(options):
+    """Returns (exit code, summary dict)."""
+    summary = {"files": [], "missing": [], "ok": 0, "skipped": 0, "failed": 0, "error": None}
+    files, summary["missing"] = collect_media_files(options.inputs, options.recursive)
+    for path in summary["missing"]:
+        print(f"Input not found: {path}", file=sys.stderr)
+    if not files:
+        summary["error"] = "No media files found."
+        return EXIT_USAGE, summary
+
+    try:
+        import pysubs2  # noqa: F401 - checked up front instead of after the first transcription
+        import faster_whisper  # noqa: F401
+    except ImportError as e:
+        summary["error"] = f"Missing module: {e.name}. Install the add-on's dependencies first."
+        return EXIT_SETUP, summary
+
+    if options.output_dir:
+        os.makedirs(options.output_dir, exist_ok=True)
+    if options.offline and not options.model_dir:
+        summary["error"] = "--offline needs --model-dir."
+        return EXIT_USAGE, summary
+    transcribe_kwargs = get_transcribe_kwargs(options)
+    language_detection = get_language_detection(options)
+    model_config = [options.model, options.device, options.compute_type, options.cpu_threads, 1]
+    models = {}
+
+    def get_model(detector_size=None):
+        # One warm model (plus the language detector) for the whole run, loaded on the first cache miss
+        if detector_size not in models:
+            config = model_config if detector_size is None else whisper_worker.detector_config(model_config, detector_size)
+            print(f"Loading Faster Whisper model: {config[0]} ({config[1]}, {config[2]})", file=sys.stderr)
+            models[detector_size] = whisper_worker.load_model(
+                config, (options.model_dir, options.offline) if options.model_dir else None,
+            )
+        return models[detector_size]
+
+    collisions = find_output_collisions(files, options.formats, options.output_dir)
+    for index, (media, subdir) in enumerate(files):
+        print(f"[{index + 1}/{len(files)}] {media}", file=sys.stderr)
+        outputs = sidecar_paths(media, options.formats, options.output_dir, subdir)
+        if media in collisions:
+            message = f"Its subtitles would overwrite those of {collisions[media]}."
+            print(message, file=sys.stderr)
+            summary["files"].append({"file": media, "status": "error", "message": message, "outputs": outputs})
+            summary["failed"] += 1
+            continue
+        if not options.overwrite and all(os.path.exists(path) for path in outputs):
+            summary["files"].append({"file": media, "status": "skipped", "outputs": outputs})
+            summary["skipped"] += 1
+            continue
+        try:
+            entry = transcribe_media(get_model, media, outputs, options, transcribe_kwargs, language_detection)
+        except whisper_worker.ModelLoadError as e:
+            summary["error"] = f"Failed to load model '{options.model}': {e}"
+            return EXIT_SETUP, summary
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            entry = {"file": media, "status": "error", "message": str(e)}
+        summary["files"].append(entry)
+        summary["ok" if entry["status"] == "ok" else "failed"] += 1
+
+    failed = summary["failed"] or summary["missing"]
+    return (EXIT_FAILED_FILES if failed else EXIT_OK), summary
+
+
+def main(argv=None):
+    args = script_args(sys.argv if argv is None else argv)
+    try:
+        options = parse_args(args)
+    except SystemExit as e:
+        # argparse exits with 0 for --help and 2 for errors
+        return e.code if isinstance(e.code, int) else EXIT_USAGE
+
+    # Library chatter goes to stderr so stdout stays machine-readable
+    summary_out = sys.stdout
+    sys.stdout = sys.stderr
+    started = time.monotonic()
+    try:
+        code, summary = run(options)
+    finally:
+        sys.stdout = summary_out
+    summary["exit_code"] = code
+    summary["elapsed"] = round(time.monotonic() - started, 3)
+
+    text = json.dumps(summary, indent=2)
+    if options.summary:
+        with open(options.summary, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1144 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Out-of-process Faster Whisper worker for the Subtitle Editor add-on.
+
+Started by the add-on with Blender's Python executable (no bpy available), so
+batch transcription can fan out across several processes. Talks JSON lines:
+
+    stdin, first line:  {"model": [model_size, device, compute_type, cpu_threads, num_workers],
+                         "transcribe": {...model.transcribe kwargs...},
+                         "cache_dir": <result cache directory> | null,
+                         "decode_cache": [<directory>, <max bytes>] | null,
+                         "checkpoint_dir": <fallback checkpoint directory> | null,
+                         "model_store": [<local model directory>, <offline>] | null,
+                         "language_detection": {"model": <size>, "cache_dir": <dir>} | null}
+    stdin, then:        {"id": <int>, "audio": <path>, "clip": [start, end] | null, "language": <code>} per file; EOF to quit
+    stdout:             {"type": "ready" | "info" | "segment" | "file_done" | "error" | "fatal", ...}
+
+With `--detect-language <json>` it detects the language of every {"files": [[path, clip], ...]}
+entry with one detector and prints a {"index", "language" | "error"} line per file
+(see detect_language).
+
+With `--benchmark <json>` it loads one model configuration, times it on
+synthetic speech and prints the result (see run_benchmark).
+
+With `--serve <state dir>` it instead runs as a shared server on 127.0.0.1 that
+keeps its models warm across connections (and Blender instances). Each
+connection speaks the same protocol, with a "token" from <state dir>/server.json
+in the config line. The server exits after --idle-timeout seconds without work.
+
+The helpers here are also imported by the add-on itself, so nothing at module
+level may depend on being run as a worker.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import socket
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, namedtuple
+
+SAMPLE_RATE = 16000 # Whisper models work on 16 kHz mono audio
+
+protocol_out = sys.stdout
+
+
+def load_audio_window(audio, clip, decode_cache=None):
+    """Returns what model.transcribe should be fed for `audio`.
+
+    With clip=(start, end) in seconds only that window of the decoded samples is
+    returned, so the model never runs over the trimmed-away parts of a file.
+    Timestamps in the result are then relative to `start`. With a decode_cache
+    of (directory, max_bytes) the samples come memory-mapped from there.
+    """
+    if not clip and not decode_cache:
+        return audio
+    return decode_window(audio, clip, decode_cache)
+
+
+def decode_window(audio, clip, decode_cache=None):
+    """16 kHz samples of `audio`, limited to the clip=(start, end) window in seconds when given."""
+    samples = load_decoded_audio(audio, *decode_cache) if decode_cache else None
+    if samples is None:
+        if clip:
+            return decode_audio_range(audio, *clip)
+        from faster_whisper import decode_audio
+        return decode_audio(audio, sampling_rate=SAMPLE_RATE)
+    if not clip:
+        return samples
+    start, end = clip
+    # Slicing a memmap is a view, nothing is copied here
+    return samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE) if end is not None else None]
+
+
+def decode_audio_range(audio, start=0.0, end=None):
+    """16 kHz mono float32 samples of `audio` from start to end seconds, decoding only that range.
+
+    Seeks in the container instead of decoding the file from its beginning, so a
+    short window of a long file costs about as much as the window itself. Sample
+    0 matches sample int(start * SAMPLE_RATE) of faster_whisper.decode_audio.
+    """
+    import av
+    import numpy as np
+    resampler = av.audio.resampler.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+    chunks = []
+    first = None # Source time of the first decoded frame, relative to the stream start
+    with av.open(audio, mode="r", metadata_errors="ignore") as container:
+        stream = container.streams.audio[0]
+        origin = float(stream.start_time * stream.time_base) if stream.start_time is not None else 0.0
+        if start > 0:
+            # Lands on the last seek point before start, with some preroll so codecs like mp3
+            # have settled by the first kept sample; the overshoot is trimmed below
+            container.seek(int((origin + max(0.0, start - 0.5)) * av.time_base), backward=True, any_frame=False)
+        for frame in container.decode(stream):
+            if frame.time is None and start > 0:
+                # No timestamps to trim the seek overshoot with
+                from faster_whisper import decode_audio
+                samples = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+                return samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE) if end is not None else None]
+            frame_time = frame.time - origin if frame.time is not None else 0.0
+            if end is not None and frame_time >= end:
+                break
+            if first is None:
+                first = frame_time
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray().reshape(-1))
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    samples = np.concatenate(chunks).astype(np.float32) / 32768.0
+    skip = max(0, int(round((start - min(first, start)) * SAMPLE_RATE)))
+    stop = skip + int(round((end - start) * SAMPLE_RATE)) if end is not None else None
+    return samples[skip:stop]
+
+
+def probe_audio_duration(audio):
+    """Duration of `audio` in seconds from the container header, None when it doesn't say."""
+    try:
+        import av
+        with av.open(audio, mode="r", metadata_errors="ignore") as container:
+            if container.duration is not None:
+                return container.duration / av.time_base
+    except Exception:
+        pass
+    return None
+
+
+def plan_speech_chunks(audio, clip, decode_cache=None, num_chunks=2, min_chunk_seconds=60.0, min_silence_ms=500):
+    """Splits audio into windows that can be transcribed independently.
+
+    A VAD pass finds speech; windows of about duration / num_chunks (never
+    shorter than min_chunk_seconds) are cut in the middle of the silence between
+    two speech regions, so no word is split. Returns [(start, end), ...] in
+    source seconds, covering the whole clip (or file). This VAD pass is the only
+    full decode: without a cached copy each chunk worker decodes just its window.
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+    samples = decode_window(audio, clip, decode_cache)
+    offset = clip[0] if clip else 0.0
+    total = len(samples) / SAMPLE_RATE
+    target = max(min_chunk_seconds, total / max(1, num_chunks))
+    if total <= target:
+        return [(offset, offset + total)]
+
+    speech = get_speech_timestamps(samples, VadOptions(min_silence_duration_ms=min_silence_ms))
+    cuts = []
+    chunk_start = 0.0
+    previous_end = None
+    for region in speech:
+        start = region["start"] / SAMPLE_RATE
+        if previous_end is not None and start - chunk_start >= target:
+            cut = (previous_end + start) / 2
+            cuts.append(cut)
+            chunk_start = cut
+        previous_end = region["end"] / SAMPLE_RATE
+    boundaries = [0.0] + cuts + [total]
+    return [(offset + a, offset + b) for a, b in zip(boundaries, boundaries[1:])]
+
+
+# --- Decode Cache ---
+# Audio resampled to 16 kHz mono float32 is kept as .npy files keyed by path,
+# mtime and size, so re-runs (other models, other windows) skip ffmpeg decoding
+# and get a memory-mapped array instead.
+
+def decoded_audio_key(path):
+    stat = os.stat(path)
+    ident = f"{os.path.normcase(os.path.realpath(path))}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.blake2b(ident.encode(), digest_size=16).hexdigest()
+
+
+def load_decoded_audio(path, cache_dir, max_bytes):
+    """16 kHz mono float32 samples of `path` as a read-only memmap, decoding into the cache on a miss.
+
+    Returns None for files that would never fit in max_bytes, which callers then
+    decode (just the range they need) without the cache.
+    """
+    import numpy as np
+    npy_path = os.path.join(cache_dir, decoded_audio_key(path) + ".npy")
+    if os.path.exists(npy_path):
+        os.utime(npy_path) # Mark as recently used for eviction
+        return np.load(npy_path, mmap_mode="r")
+
+    duration = probe_audio_duration(path)
+    if duration is not None and duration * SAMPLE_RATE * 4 > max_bytes:
+        return None # Would never fit, don't decode it all just to find out
+    from faster_whisper import decode_audio
+    samples = decode_audio(path, sampling_rate=SAMPLE_RATE)
+    if samples.nbytes > max_bytes:
+        return samples # Would never fit, don't churn the cache for it
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{npy_path}.{os.getpid()}.tmp" # Unique per process, workers may race on one file
+    with open(tmp_path, "wb") as f:
+        np.save(f, samples.astype(np.float32, copy=False))
+    os.replace(tmp_path, npy_path)
+    evict_decoded_audio(cache_dir, max_bytes, keep=npy_path)
+    return np.load(npy_path, mmap_mode="r")
+
+
+def evict_decoded_audio(cache_dir, max_bytes, keep=None):
+    """Deletes least recently used decoded files until the cache fits in max_bytes."""
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".npy") and entry.path != keep:
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _mtime, size, _path in entries)
+    if keep and os.path.exists(keep):
+        total += os.path.getsize(keep)
+    for _mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass # Still mapped by another process (Windows)
+
+
+# --- Result Cache ---
+# Finished transcriptions are stored as JSON lines under a key derived from the
+# audio content and every parameter that changes the output: a header line with
+# the TranscriptionInfo fields, then one line per segment.
+
+CachedInfo = namedtuple("CachedInfo", "language language_probability duration")
+CachedSegment = namedtuple("CachedSegment", "start end text words")
+
+
+def audio_content_hash(path, sample_size=1 << 20):
+    """Fast content hash of an audio file: its size plus the first, middle and last MiB."""
+    h = hashlib.blake2b(digest_size=16)
+    size = os.path.getsize(path)
+    h.update(str(size).encode())
+    with open(path, "rb") as f:
+        if size <= 3 * sample_size:
+            h.update(f.read())
+        else:
+            for offset in (0, size // 2 - sample_size // 2, size - sample_size):
+                f.seek(offset)
+                h.update(f.read(sample_size))
+    return h.hexdigest()
+
+
+def result_cache_key(audio, clip, model_id, transcribe_kwargs):
+    params = json.dumps([audio_content_hash(audio), clip, model_id, transcribe_kwargs], sort_keys=True)
+    return hashlib.blake2b(params.encode(), digest_size=16).hexdigest()
+
+
+def read_result_file(path):
+    """Reads a result cache entry or checkpoint. Returns (CachedInfo, [CachedSegment, ...]) or None.
+
+    A truncated last line (a checkpoint written when Blender died) is ignored.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            info = CachedInfo(**json.loads(f.readline()))
+            segments = []
+            for line in f:
+                try:
+                    start, end, text, words = json.loads(line)
+                except ValueError:
+                    break
+                segments.append(CachedSegment(start, end, text, words))
+    except (OSError, ValueError, TypeError):
+        return None
+    return info, segments
+
+
+def load_cached_result(cache_dir, key):
+    """Returns (CachedInfo, [CachedSegment, ...]) or None on a miss."""
+    return read_result_file(os.path.join(cache_dir, key + ".jsonl"))
+
+
+def store_cached_result(cache_dir, key, info, segments):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, key + ".jsonl")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "duration": info.duration,
+        }) + "\n")
+        for segment in segments:
+            f.write(json.dumps([segment.start, segment.end, segment.text, segment_words(segment)], ensure_ascii=False) + "\n")
+    # Readers never see a half-written file
+    os.replace(tmp_path, path)
+
+
+def segment_words(segment):
+    """[[start, end, word, probability], ...] for a faster-whisper or cached segment, None without word timings."""
+    words = getattr(segment, "words", None)
+    if not words:
+        return None
+    return [[w.start, w.end, w.word, w.probability] if hasattr(w, "word") else list(w) for w in words]
+
+
+def shifted_segment(segment, shift):
+    """A CachedSegment of `segment` with its (word) timestamps moved by `shift` seconds."""
+    words = segment_words(segment)
+    if words:
+        words = [[start + shift, end + shift, word, probability] for start, end, word, probability in words]
+    return CachedSegment(segment.start + shift, segment.end + shift, segment.text, words)
+
+
+def caching_segments(segments, info, cache_dir, key):
+    """Passes segments through and stores them once the generator is exhausted (not when closed early)."""
+    collected = []
+    try:
+        for segment in segments:
+            collected.append(segment)
+            yield segment
+    except GeneratorExit:
+        segments.close()
+        raise
+    try:
+        store_cached_result(cache_dir, key, info, collected)
+    except OSError as e:
+        print(f"Could not write transcription cache: {e}", file=sys.stderr)
+
+
+# --- Checkpoints ---
+# While a file is transcribed, finished segments are appended to a sidecar file
+# next to the audio (same format as a result cache entry). If the run is
+# cancelled or Blender dies, the next run with the same parameters replays them
+# and only decodes the audio after the last checkpointed segment.
+
+CHECKPOINT_INTERVAL = 5.0 # Seconds between flushes to disk
+
+
+def checkpoint_path(audio, key, fallback_dir):
+    """Sidecar checkpoint path next to the audio, or in fallback_dir when that folder is read-only."""
+    folder = os.path.dirname(os.path.abspath(audio))
+    if not os.access(folder, os.W_OK):
+        os.makedirs(fallback_dir, exist_ok=True)
+        folder = fallback_dir
+    return os.path.join(folder, f"{os.path.basename(audio)}.{key[:12]}.whisper-checkpoint")
+
+
+def checkpointed_segments(segments, info, path, done, shift):
+    """Replays checkpointed segments, then passes new ones through (shifted by `shift` seconds) while appending them to `path`.
+
+    The checkpoint is deleted once the generator is exhausted, and kept when it
+    is closed early so the next run can resume.
+    """
+    for segment in done:
+        yield segment
+    # Rewritten rather than appended to, which drops a torn last line from a crash
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "duration": info.duration,
+        }) + "\n")
+        for segment in done:
+            f.write(json.dumps([segment.start, segment.end, segment.text, segment.words], ensure_ascii=False) + "\n")
+        last_flush = time.monotonic()
+        try:
+            for segment in segments:
+                if shift:
+                    segment = shifted_segment(segment, shift)
+                f.write(json.dumps([segment.start, segment.end, segment.text, segment_words(segment)], ensure_ascii=False) + "\n")
+                if time.monotonic() - last_flush > CHECKPOINT_INTERVAL:
+                    f.flush()
+                    last_flush = time.monotonic()
+                yield segment
+        except GeneratorExit:
+            segments.close()
+            raise
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# --- Adaptive Beam Search ---
+# Decode greedily first, then run the configured beam search again over just
+# the segments greedy decoding was unsure about.
+
+ADAPTIVE_THRESHOLDS = {"log_prob_threshold": -0.6, "no_speech_threshold": 0.5, "compression_ratio_threshold": 2.2}
+
+
+def is_uncertain(segment, thresholds):
+    return (
+        segment.avg_logprob < thresholds["log_prob_threshold"]
+        or segment.no_speech_prob > thresholds["no_speech_threshold"]
+        or segment.compression_ratio > thresholds["compression_ratio_threshold"]
+    )
+
+
+def adaptive_segments(model, samples, segments, info, transcribe_kwargs, thresholds):
+    """Passes greedy `segments` through, splicing in beam-search re-decodes of the uncertain ones."""
+    redo_kwargs = dict(transcribe_kwargs)
+    redo_kwargs.update(language=info.language, vad_filter=False, condition_on_previous_text=False)
+    redo_kwargs.pop("vad_parameters", None)
+    previous_text = ""
+    redone = total = 0
+    try:
+        for segment in segments:
+            total += 1
+            if not is_uncertain(segment, thresholds):
+                previous_text = segment.text
+                yield segment
+                continue
+            redone += 1
+            window = samples[int(segment.start * SAMPLE_RATE):int(segment.end * SAMPLE_RATE)]
+            redo, _info = model.transcribe(window, initial_prompt=previous_text.strip() or None, **redo_kwargs)
+            redo = [shifted_segment(s, segment.start) for s in redo if s.text.strip()]
+            if redo:
+                for new_segment in redo:
+                    yield new_segment
+                previous_text = redo[-1].text
+            elif segment.no_speech_prob <= thresholds["no_speech_threshold"]:
+                previous_text = segment.text
+                yield segment
+            # else: beam search agrees there is no speech; drop the greedy guess
+    except GeneratorExit:
+        segments.close()
+        raise
+    print(f"Adaptive beam: re-decoded {redone} of {total} segment(s).", file=sys.stderr)
+
+
+# --- Language Detection ---
+# With language "auto", a small model detects the language once per file from a
+# few windows spread over it, and the result is cached by audio content hash.
+# The large model is then told the language instead of detecting it itself.
+
+def detector_config(model_config, detector_size):
+    """Model config of the small language detection model, on the same device as `model_config`."""
+    _model_size, device, _compute_type, cpu_threads, _num_workers = model_config
+    return [detector_size, device, "int8", cpu_threads, 1]
+
+
+def detector_available(detector_size, model_store=None):
+    """False when offline mode would refuse to load the detector, so detection is skipped up front."""
+    if not model_store or not model_store[0] or not model_store[1]:
+        return True
+    return verify_model(local_model_path(model_store[0], detector_size)) is None
+
+
+def detect_language(detector, audio, clip=None, decode_cache=None, cache_dir=None, num_windows=3, window_seconds=30.0):
+    """Returns (language, probability) for `audio`, averaged over num_windows windows.
+
+    detector is a WhisperModel, or a callable returning one so a cached answer
+    never loads it. Answers are cached per file content and clip, since a trimmed
+    strip may only cover part of a multilingual file.
+    """
+    path = None
+    if cache_dir:
+        key = hashlib.blake2b(json.dumps([audio_content_hash(audio), clip]).encode(), digest_size=16).hexdigest()
+        path = os.path.join(cache_dir, key + ".json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            return cached["language"], cached["probability"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    samples = decode_window(audio, clip, decode_cache)
+    model = detector() if callable(detector) else detector
+    window = int(window_seconds * SAMPLE_RATE)
+    if len(samples) <= window:
+        starts = [0]
+    else:
+        starts = [int((len(samples) - window) * (i + 0.5) / num_windows) for i in range(num_windows)]
+    scores = {}
+    for start in starts:
+        _language, _probability, all_probabilities = model.detect_language(samples[start:start + window])
+        for language, probability in all_probabilities:
+            scores[language] = scores.get(language, 0.0) + probability / len(starts)
+    language = max(scores, key=scores.get)
+    probability = scores[language]
+    print(f"Detected language of '{os.path.basename(audio)}': {language} ({probability:.2f})", file=sys.stderr)
+
+    if path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"language": language, "probability": probability}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not cache detected language: {e}", file=sys.stderr)
+    return language, probability
+
+
+def transcribe(get_model, audio, clip, model_id, transcribe_kwargs, cache_dir=None, decode_cache=None, checkpoint_dir=None, language_detection=None):
+    """Returns (segments generator, info) like WhisperModel.transcribe, served from the result cache when possible.
+
+    get_model() is only called on a cache miss, so fully cached work never loads a
+    model. With checkpoint_dir set, progress is checkpointed and an interrupted
+    run with the same parameters resumes where it stopped. With
+    language_detection={"model": <size>, "cache_dir": <dir>} and no language
+    set, get_model(<size>) detects it first (see detect_language).
+    """
+    key = None
+    if cache_dir or checkpoint_dir:
+        key = result_cache_key(audio, clip, model_id, transcribe_kwargs)
+    if cache_dir:
+        cached = load_cached_result(cache_dir, key)
+        if cached is not None:
+            info, segments = cached
+            return (segment for segment in segments), info
+
+    done = []
+    resume_at = 0.0
+    path = None
+    if checkpoint_dir:
+        path = checkpoint_path(audio, key, checkpoint_dir)
+        resumed = read_result_file(path)
+        if resumed and resumed[1]:
+            info, done = resumed
+            resume_at = done[-1].end
+            print(f"Resuming '{os.path.basename(audio)}' from checkpoint at {resume_at:.1f}s", file=sys.stderr)
+            transcribe_kwargs = dict(transcribe_kwargs)
+            # Keep the language of the first run instead of detecting it again on the remainder
+            if transcribe_kwargs.get("language") is None:
+                transcribe_kwargs["language"] = info.language
+            clip_start, clip_end = clip if clip else (0.0, None)
+            clip = (clip_start + resume_at, clip_end)
+        elif os.path.exists(path):
+            os.remove(path) # Header only or unreadable, start over
+
+    transcribe_kwargs = dict(transcribe_kwargs)
+    if language_detection and transcribe_kwargs.get("language") is None and not model_id[0].endswith(".en"):
+        try:
+            transcribe_kwargs["language"], _probability = detect_language(
+                lambda: get_model(language_detection["model"]), audio, clip, decode_cache, language_detection.get("cache_dir")
+            )
+        except Exception as e:
+            # Not worth failing the file over: the transcription model detects the language itself
+            print(f"Language detection for '{os.path.basename(audio)}' failed, the transcription model detects it instead: {e}", file=sys.stderr)
+    model = get_model()
+    # {"log_prob_threshold", ...}: greedy first pass, beam search only where it is unsure
+    adaptive = transcribe_kwargs.pop("adaptive", None)
+    if "batch_size" in transcribe_kwargs:
+        from faster_whisper import BatchedInferencePipeline
+        model = BatchedInferencePipeline(model=model)
+        adaptive = None # The batched pipeline decodes whole batches at once
+    if adaptive is not None:
+        samples = decode_window(audio, clip, decode_cache)
+        segments, new_info = model.transcribe(audio=samples, **dict(transcribe_kwargs, beam_size=1))
+        segments = adaptive_segments(
+            model, samples, segments, new_info if not done else info, transcribe_kwargs, dict(ADAPTIVE_THRESHOLDS, **adaptive)
+        )
+    else:
+        segments, new_info = model.transcribe(audio=load_audio_window(audio, clip, decode_cache), **transcribe_kwargs)
+    if not done:
+        info = new_info
+    if path:
+        segments = checkpointed_segments(segments, info, path, done, resume_at)
+    if cache_dir:
+        segments = caching_segments(segments, info, cache_dir, key)
+    return segments, info
+
+
+# --- Word Timings ---
+
+class WordTimings:
+    """Word-level timings of one transcript in parallel arrays.
+
+    starts/ends/probabilities are float32 arrays and the words themselves live in
+    one UTF-8 buffer indexed by offsets, so an hour of speech stays a few hundred
+    KB and can be re-split into subtitles without running the model again.
+    """
+
+    MAGIC = b"SEWT1"
+
+    def __init__(self):
+        self.starts = array("f")
+        self.ends = array("f")
+        self.probabilities = array("f")
+        self.offsets = array("I", [0])
+        self.text = bytearray()
+
+    def __len__(self):
+        return len(self.starts)
+
+    def append(self, start, end, word, probability):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.probabilities.append(probability)
+        self.text += word.encode("utf-8")
+        self.offsets.append(len(self.text))
+
+    def extend(self, words, shift=0.0):
+        """Adds [[start, end, word, probability], ...] as returned by segment_words."""
+        for start, end, word, probability in words or ():
+            self.append(start + shift, end + shift, word, probability)
+
+    def word(self, index):
+        return self.text[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.MAGIC + struct.pack("<I", len(self)))
+            for values in (self.starts, self.ends, self.probabilities, self.offsets):
+                f.write(values.tobytes()) # Machine byte order; the file never leaves this machine
+            f.write(self.text)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        store = cls()
+        with open(path, "rb") as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"Not a word timings file: {path}")
+            (count,) = struct.unpack("<I", f.read(4))
+            store.starts.fromfile(f, count)
+            store.ends.fromfile(f, count)
+            store.probabilities.fromfile(f, count)
+            store.offsets = array("I")
+            store.offsets.fromfile(f, count + 1)
+            store.text = bytearray(f.read())
+        return store
+
+    def resegment(self, max_chars=42, max_duration=6.0, max_gap=0.8):
+        """Groups the words into subtitle lines. Returns [(start, end, text), ...].
+
+        A line is closed before it would exceed max_chars or max_duration, when the
+        pause before the next word is longer than max_gap, or after a sentence
+        ending once it is at least half full.
+        """
+        lines = []
+        words = []
+        line_start = line_end = 0.0
+        for index in range(len(self)):
+            start, end, word = self.starts[index], self.ends[index], self.word(index)
+            if words:
+                candidate = ("".join(words) + word).strip()
+                if (len(candidate) > max_chars or end - line_start > max_duration or start - line_end > max_gap):
+                    lines.append((line_start, line_end, "".join(words).strip()))
+                    words = []
+            if not words:
+                line_start = start
+            words.append(word)
+            line_end = end
+            text = "".join(words).strip()
+            if text.endswith((".", "?", "!")) and len(text) >= max_chars // 2:
+                lines.append((line_start, line_end, text))
+                words = []
+        if words:
+            lines.append((line_start, line_end, "".join(words).strip()))
+        return lines
+
+
+# --- Local Model Store ---
+
+MODEL_MANIFEST = "manifest.json"
+MODEL_REQUIRED_FILES = ("model.bin", "config.json")
+
+
+def local_model_path(model_dir, model_size):
+    return os.path.join(model_dir, model_size)
+
+
+def model_files(path):
+    """The files making up a converted CTranslate2 model folder (download bookkeeping left out)."""
+    return sorted(
+        entry.name for entry in os.scandir(path)
+        if entry.is_file() and entry.name != MODEL_MANIFEST and not entry.name.startswith(".")
+    )
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_model_manifest(path):
+    manifest = {
+        name: {"size": os.path.getsize(os.path.join(path, name)), "sha256": file_sha256(os.path.join(path, name))}
+        for name in model_files(path)
+    }
+    with open(os.path.join(path, MODEL_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def verify_model(path, full=False):
+    """Returns None if the model folder at `path` is intact, else what is wrong with it.
+
+    The quick check compares file sizes with the manifest written when the model
+    was fetched; full=True also compares SHA-256 hashes.
+    """
+    if not os.path.isdir(path):
+        return "not downloaded"
+    missing = [name for name in MODEL_REQUIRED_FILES if not os.path.isfile(os.path.join(path, name))]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    try:
+        with open(os.path.join(path, MODEL_MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return "no manifest, verify it to create one"
+    for name, expected in manifest.items():
+        file_path = os.path.join(path, name)
+        if not os.path.isfile(file_path):
+            return f"missing {name}"
+        if os.path.getsize(file_path) != expected["size"]:
+            return f"{name} has the wrong size"
+        if full and file_sha256(file_path) != expected["sha256"]:
+            return f"{name} is corrupt (checksum mismatch)"
+    return None
+
+
+def prefetch_model(model_size, model_dir):
+    """Downloads `model_size` from the Hugging Face hub into the model store and records its manifest."""
+    from faster_whisper.utils import download_model
+    path = local_model_path(model_dir, model_size)
+    download_model(model_size, output_dir=path)
+    write_model_manifest(path)
+    return path
+
+
+def resolve_model(model_size, model_store=None):
+    """What to pass to WhisperModel for `model_size`: the local copy when the store has an intact one.
+
+    model_store is (model_dir, offline). Offline, a missing or damaged local
+    copy raises ModelLoadError instead of falling back to the hub.
+    """
+    if not model_store or not model_store[0]:
+        return model_size
+    model_dir, offline = model_store
+    path = local_model_path(model_dir, model_size)
+    problem = verify_model(path)
+    if problem is None:
+        return path
+    if offline:
+        raise ModelLoadError(f"Model '{model_size}' in {model_dir} is not usable ({problem}) and offline mode is on.")
+    if os.path.isdir(path):
+        print(f"Ignoring local model '{model_size}' ({problem}), loading it from the hub.", file=sys.stderr)
+    return model_size
+
+
+# --- Subtitle Files ---
+
+SUBTITLE_FORMATS = ("srt", "ass", "ssa", "mpl2", "vtt", "fountain")
+
+
+def save_subtitles(events, file_name, fmt):
+    """Writes events of (start_ms, end_ms, text, bold, italic) as a `fmt` subtitle file.
+
+    Shared by the export operator and the headless entry point. Needs pysubs2
+    for everything but fountain.
+    """
+    if fmt == "fountain":
+        text = ""
+        for event in events:
+            text = text + event[2] + chr(10) + chr(13) + " " + chr(10) + chr(13)
+        with open(file_name, "w") as fountain_file:
+            fountain_file.write(text)
+        return
+    from pysubs2 import SSAFile, SSAEvent
+    subs = SSAFile()
+    for start, end, text, bold, italic in events:
+        event = SSAEvent()
+        event.start = start
+        event.end = end
+        event.text = text
+        event.bold = bold
+        event.italic = italic
+        subs.append(event)
+    #            if fmt == "microdvd": #doesn't work
+    #                subs.save(file_name, format_="microdvd", fps=(scene.render.fps / scene.render.fps_base))
+    if fmt == "mpl2":
+        subs.save(file_name, format_="mpl2")
+    else:
+        subs.save(file_name)
+
+
+class ModelLoadError(Exception):
+    pass
+
+
+def emit(message):
+    protocol_out.write(json.dumps(message) + "\n")
+    protocol_out.flush()
+
+
+def load_model(model_config, model_store=None):
+    try:
+        from faster_whisper import WhisperModel
+        model_size, device, compute_type, cpu_threads, num_workers = model_config
+        return WhisperModel(
+            resolve_model(model_size, model_store),
+            device=device, compute_type=compute_type, cpu_threads=cpu_threads, num_workers=num_workers,
+        )
+    except ModelLoadError:
+        raise
+    except Exception as e:
+        raise ModelLoadError(str(e)) from e
+
+
+def transcribe_file(get_model, job_id, audio, clip, config, send=emit, language=None):
+    model_size, _device, compute_type = config["model"][:3]
+    transcribe_kwargs = config["transcribe"]
+    if language and transcribe_kwargs.get("language") is None:
+        # Detected once for the whole file by the coordinator
+        transcribe_kwargs = dict(transcribe_kwargs, language=language)
+    segments, info = transcribe(
+        get_model, audio, clip, [model_size, compute_type], transcribe_kwargs,
+        config.get("cache_dir"), config.get("decode_cache"), config.get("checkpoint_dir"),
+        config.get("language_detection"),
+    )
+    send({
+        "type": "info",
+        "id": job_id,
+        "language": info.language,
+        "probability": info.language_probability,
+        "duration": info.duration,
+    })
+    for segment in segments:
+        send({
+            "type": "segment",
+            "id": job_id,
+            "start": segment.start,
+            "end": segment.end,
+            "text": segment.text.strip(),
+            "words": segment_words(segment),
+        })
+    send({"type": "file_done", "id": job_id})
+
+
+def serve_jobs(lines, get_model, config, send=emit):
+    """Transcribes the files requested on `lines`. Returns False if the model could not be loaded."""
+    for line in lines:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        try:
+            transcribe_file(get_model, job["id"], job["audio"], job.get("clip"), config, send, job.get("language"))
+        except ModelLoadError as e:
+            # The file goes back to the coordinator as unprocessed
+            send({"type": "fatal", "message": str(e)})
+            return False
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            send({"type": "error", "id": job["id"], "message": str(e)})
+    return True
+
+
+def main():
+    global protocol_out
+    if len(sys.argv) > 2 and sys.argv[1] == "--benchmark":
+        # One configuration per process, so peak memory is its own and a crash only loses this run
+        config = json.loads(sys.argv[2])
+        protocol_out = sys.stdout
+        sys.stdout = sys.stderr
+        try:
+            emit(run_benchmark(config["model"], config.get("model_store"), config.get("beam_size", 5)))
+        except Exception as e:
+            emit({"error": str(e)})
+            return 1
+        return 0
+
+    if len(sys.argv) > 2 and sys.argv[1] == "--detect-language":
+        config = json.loads(sys.argv[2])
+        protocol_out = sys.stdout
+        sys.stdout = sys.stderr
+        detection = config["language_detection"]
+        detector = []
+
+        def get_detector():
+            # Loaded on the first file missing from the cache, then kept for the rest
+            if not detector:
+                detector.append(load_model(detector_config(config["model"], detection["model"]), config.get("model_store")))
+            return detector[0]
+
+        for index, (audio, clip) in enumerate(config["files"]):
+            try:
+                language, probability = detect_language(
+                    get_detector, audio, clip, config.get("decode_cache"), detection.get("cache_dir"),
+                )
+            except ModelLoadError as e:
+                emit({"index": index, "error": str(e)})
+                return 1 # Every other file would fail the same way
+            except Exception as e:
+                emit({"index": index, "error": str(e)})
+                continue
+            emit({"index": index, "language": language, "probability": probability})
+        return 0
+
+    if len(sys.argv) > 2 and sys.argv[1] == "--serve":
+        idle_timeout = SERVER_IDLE_TIMEOUT
+        if "--idle-timeout" in sys.argv:
+            idle_timeout = float(sys.argv[sys.argv.index("--idle-timeout") + 1])
+        return WorkerServer(sys.argv[2], idle_timeout).serve_forever()
+
+    # Keep the real stdout for the protocol; anything the libraries print goes to stderr.
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+
+    config = json.loads(sys.stdin.readline())
+    models = {}
+
+    def get_model(detector_size=None):
+        # Loaded on the first cache miss only, then kept for the following files
+        if detector_size not in models:
+            model_config = config["model"] if detector_size is None else detector_config(config["model"], detector_size)
+            models[detector_size] = load_model(model_config, config.get("model_store"))
+        return models[detector_size]
+
+    emit({"type": "ready"})
+    return 0 if serve_jobs(sys.stdin, get_model, config) else 1
+
+
+# --- Benchmark ---
+
+BENCHMARK_SECONDS = 20.0
+
+
+def synthetic_speech(seconds=BENCHMARK_SECONDS, seed=0):
+    """Deterministic speech-like audio: voiced harmonics with a syllable-rate envelope and some noise.
+
+    Not intelligible, but it keeps the encoder and decoder as busy as speech does,
+    which is all a timing comparison between configurations needs.
+    """
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 120.0 + 30.0 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    syllables = np.clip(np.sin(2 * np.pi * 4.0 * t), 0.0, None) * (np.sin(2 * np.pi * 0.25 * t) > -0.7)
+    audio = 0.3 * voiced * syllables + 0.01 * rng.standard_normal(t.size)
+    return audio.astype(np.float32)
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(model_config, model_store=None, beam_size=5):
+    """Times one model configuration on BENCHMARK_SECONDS of synthetic speech.
+
+    Returns {"rtf": transcription time / audio duration, "load_seconds", "peak_mb"}.
+    """
+    audio = synthetic_speech()
+    started = time.perf_counter()
+    model = load_model(model_config, model_store)
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    segments, _info = model.transcribe(
+        audio, language="en", beam_size=beam_size, vad_filter=False, condition_on_previous_text=False
+    )
+    for _segment in segments:
+        pass
+    elapsed = time.perf_counter() - started
+    return {
+        "rtf": elapsed / BENCHMARK_SECONDS,
+        "load_seconds": load_seconds,
+        "peak_mb": peak_memory_mb(),
+    }
+
+
+# --- Shared Worker Server ---
+
+SERVER_STATE_FILE = "server.json"
+SERVER_IDLE_TIMEOUT = 600.0 # Seconds without connections before the server exits
+SERVER_MAX_MODELS = 2 # Warm models kept; older ones are dropped on the next load
+
+
+def read_server_state(state_dir):
+    """{"port", "pid", "token", "models"} of the last started server, or None.
+
+    "models" lists the model configs the server currently keeps loaded.
+    """
+    try:
+        with open(os.path.join(state_dir, SERVER_STATE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class WorkerServer:
+    """Serves the worker protocol to any number of local connections, sharing warm models between them.
+
+    Inference runs here, outside Blender, so a crash in CTranslate2 only costs
+    the files in flight.
+    """
+
+    def __init__(self, state_dir, idle_timeout=SERVER_IDLE_TIMEOUT):
+        self.state_dir = state_dir
+        self.idle_timeout = idle_timeout
+        self.token = secrets.token_hex(16)
+        self.models = OrderedDict()
+        self.models_lock = threading.Lock()
+        self.active = 0
+        self.last_active = time.monotonic()
+        self.activity_lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.state = None # Set once listening
+
+    def write_state(self):
+        """Publishes the port, token and loaded models in the state file. Call with models_lock held."""
+        state_path = os.path.join(self.state_dir, SERVER_STATE_FILE)
+        tmp_path = f"{state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dict(self.state, models=[list(config) for config, _store in self.models]), f)
+        os.replace(tmp_path, state_path)
+
+    def get_model(self, model_config, model_store=None):
+        key = (tuple(model_config), tuple(model_store or ()))
+        # Loads are serialized so two connections asking for the same model load it once
+        with self.models_lock:
+            model = self.models.get(key)
+            if model is None:
+                while len(self.models) >= SERVER_MAX_MODELS:
+                    self.models.popitem(last=False) # Still alive for connections using it
+                print(f"Loading model {key}", file=sys.stderr)
+                model = self.models[key] = load_model(model_config, model_store)
+                try:
+                    self.write_state()
+                except OSError as e:
+                    print(f"Could not update the server state file: {e}", file=sys.stderr)
+            self.models.move_to_end(key)
+            return model
+
+    def handle(self, conn):
+        with self.activity_lock:
+            self.active += 1
+        try:
+            with conn:
+                reader = conn.makefile("r", encoding="utf-8")
+                writer = conn.makefile("w", encoding="utf-8")
+
+                def send(message):
+                    writer.write(json.dumps(message) + "\n")
+                    writer.flush()
+
+                config = json.loads(reader.readline() or "null")
+                if not isinstance(config, dict) or config.get("token") != self.token:
+                    return
+                if config.get("shutdown"):
+                    self.stopping.set()
+                    return
+                send({"type": "ready"})
+                def get_model(detector_size=None):
+                    model_config = config["model"] if detector_size is None else detector_config(config["model"], detector_size)
+                    return self.get_model(model_config, config.get("model_store"))
+
+                serve_jobs(reader, get_model, config, send)
+        except (OSError, ValueError) as e:
+            # The client went away (cancelled or closed Blender)
+            print(f"Connection ended: {e}", file=sys.stderr)
+        finally:
+            with self.activity_lock:
+                self.active -= 1
+                self.last_active = time.monotonic()
+
+    def is_idle(self):
+        with self.activity_lock:
+            return self.active == 0 and time.monotonic() - self.last_active > self.idle_timeout
+
+    def serve_forever(self):
+        # Only the server's own output goes anywhere; it has no protocol on stdout
+        sys.stdout = sys.stderr
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        listener.settimeout(1.0)
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        state_path = os.path.join(self.state_dir, SERVER_STATE_FILE)
+        self.state = {"port": listener.getsockname()[1], "pid": os.getpid(), "token": self.token}
+        with self.models_lock:
+            self.write_state()
+        print(f"Whisper worker server listening on port {self.state['port']}", file=sys.stderr)
+
+        try:
+            while not self.stopping.is_set() and not self.is_idle():
+                try:
+                    conn, _address = listener.accept()
+                except socket.timeout:
+                    continue
+                conn.settimeout(None)
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+            # A newer server may have replaced the state file already
+            if (read_server_state(self.state_dir) or {}).get("token") == self.token:
+                try:
+                    os.remove(state_path)
+                except OSError:
+                    pass
+        print("Whisper worker server stopped.", file=sys.stderr)
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())